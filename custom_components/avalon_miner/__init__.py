@@ -5,16 +5,23 @@ from __future__ import annotations
 from datetime import timedelta
 from typing import TYPE_CHECKING
 
+from homeassistant.config_entries import ConfigEntryState
 from homeassistant.const import CONF_HOST, Platform
+from homeassistant.helpers import config_validation as cv
 from homeassistant.loader import async_get_loaded_integration
 
 from .api import AvalonMinerApiClient
 from .const import CONF_POLLING_INTERVAL, CONF_PORT, DEFAULT_PORT, DOMAIN, LOGGER
 from .coordinator import AvalonMinerDataUpdateCoordinator
 from .data import AvalonMinerData
+from .metrics import AvalonMinerMetricsView
+from .parsing import DATA_BATCH_PARSER
+from .services import async_setup_services
+from .websocket_api import async_setup_websocket
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.typing import ConfigType
 
     from .data import AvalonMinerConfigEntry
 
@@ -26,6 +33,16 @@ PLATFORMS: list[Platform] = [
     Platform.BUTTON,
 ]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the integration services, websocket commands and metrics view."""
+    async_setup_services(hass)
+    async_setup_websocket(hass)
+    hass.http.register_view(AvalonMinerMetricsView())
+    return True
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -48,10 +65,23 @@ async def async_setup_entry(
         coordinator=coordinator,
     )
 
+    await coordinator.async_load()
     await coordinator.async_config_entry_first_refresh()
+    coordinator.async_start_heartbeat()
+    if coordinator.statistics is not None:
+        coordinator.statistics.async_start()
+    if coordinator.scheduler is not None:
+        await coordinator.scheduler.async_start()
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+    if coordinator.scheduler is not None:
+        # May switch the work mode, so it must not hold up the setup.
+        entry.async_create_background_task(
+            hass,
+            coordinator.scheduler.async_evaluate(),
+            f"{DOMAIN} scheduler {entry.entry_id}",
+        )
 
     return True
 
@@ -61,7 +91,18 @@ async def async_unload_entry(
     entry: AvalonMinerConfigEntry,
 ) -> bool:
     """Handle removal of an entry."""
-    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if (statistics := entry.runtime_data.coordinator.statistics) is not None:
+        # Saves the hour in progress before a reload loads it again.
+        await statistics.async_flush()
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if not any(
+        other.state is ConfigEntryState.LOADED
+        for other in hass.config_entries.async_entries(DOMAIN)
+        if other.entry_id != entry.entry_id
+    ):
+        # The parser is shared by all miners; drop it with the last one.
+        hass.data.pop(DATA_BATCH_PARSER, None)
+    return unload_ok
 
 
 async def async_reload_entry(
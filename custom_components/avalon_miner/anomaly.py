@@ -0,0 +1,189 @@
+"""Streaming anomaly detection for avalon_miner."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+from .sampling import sample_value
+
+FAN_KEYS = ("fan1_rpm", "fan2_rpm", "fan3_rpm", "fan4_rpm")
+
+ANOMALY_FAN = "fan_problem"
+ANOMALY_HASHBOARD = "hashboard_problem"
+ANOMALY_HASHRATE_DRIFT = "hashrate_drift"
+ANOMALIES = (ANOMALY_FAN, ANOMALY_HASHBOARD, ANOMALY_HASHRATE_DRIFT)
+
+# Snapshot keys each detector reads.
+ANOMALY_INPUTS = {
+    ANOMALY_FAN: FAN_KEYS,
+    ANOMALY_HASHBOARD: ("ghs_spd",),
+    ANOMALY_HASHRATE_DRIFT: ("ghs_spd", "hashrate_5m"),
+}
+
+# Lower bound of a fan's standard deviation, as a fraction of its mean RPM.
+FAN_MIN_STD = 0.05
+
+
+@dataclass(frozen=True)
+class AnomalyThresholds:
+    """Detector thresholds for one miner model."""
+
+    # Smoothing factor of the EWMA baselines.
+    alpha: float = 0.1
+    # Samples before a baseline is trusted.
+    warmup: int = 10
+    # A fan that has been spinning is dead below this speed.
+    fan_min_rpm: float = 300
+    # Standard deviations below its baseline before a fan counts as failing.
+    fan_zscore: float = 6.0
+    # Single-sample fraction of GHSspd lost that indicates a hashboard dropout.
+    hashboard_drop: float = 0.25
+    # Smoothed 5m hashrate / GHSspd ratio below which hashrate is drifting.
+    hashrate_drift_ratio: float = 0.9
+
+
+# Per-model overrides, matched case-insensitively by model prefix.
+MODEL_THRESHOLDS: dict[str, AnomalyThresholds] = {
+    # Single-board home miners: small absolute hashrate, noisy 5s values.
+    "avalon nano": AnomalyThresholds(
+        hashboard_drop=0.4, hashrate_drift_ratio=0.85
+    ),
+    "avalon q": AnomalyThresholds(hashboard_drop=0.3),
+}
+
+
+def thresholds_for_model(model: str) -> AnomalyThresholds:
+    """Return the thresholds for a model, falling back to the defaults."""
+    model = model.lower()
+    for prefix, thresholds in MODEL_THRESHOLDS.items():
+        if model.startswith(prefix):
+            return thresholds
+    return AnomalyThresholds()
+
+
+class Ewma:
+    """Exponentially weighted mean and variance in O(1) state."""
+
+    __slots__ = ("alpha", "count", "mean", "var")
+
+    def __init__(self, alpha: float) -> None:
+        """Initialize the estimator."""
+        self.alpha = alpha
+        self.count = 0
+        self.mean = 0.0
+        self.var = 0.0
+
+    def update(self, value: float) -> None:
+        """Add one observation."""
+        self.count += 1
+        if self.count == 1:
+            self.mean = value
+            return
+        diff = value - self.mean
+        incr = self.alpha * diff
+        self.mean += incr
+        self.var = (1 - self.alpha) * (self.var + diff * incr)
+
+    def zscore(self, value: float, min_std: float = 0.0) -> float:
+        """Return how many standard deviations value is from the mean.
+
+        min_std keeps a very steady signal from turning noise into outliers.
+        """
+        std = max(self.var**0.5, min_std)
+        return (value - self.mean) / std if std else 0.0
+
+
+class AnomalyMonitor:
+    """Run fan, hashboard and hashrate drift detectors on every snapshot."""
+
+    def __init__(self, thresholds: AnomalyThresholds) -> None:
+        """Initialize the monitor."""
+        self._thresholds = thresholds
+        self._fans = {key: Ewma(thresholds.alpha) for key in FAN_KEYS}
+        self._hashrate = Ewma(thresholds.alpha)
+        self._ratio = Ewma(thresholds.alpha)
+        self._elapsed = 0
+        self.problems: dict[str, list[str]] = {key: [] for key in ANOMALIES}
+
+    @property
+    def baseline_hashrate(self) -> float | None:
+        """Return the smoothed healthy GHSspd, None while warming up."""
+        if self._hashrate.count < self._thresholds.warmup:
+            return None
+        return self._hashrate.mean
+
+    def _reset_hashrate(self) -> None:
+        self._hashrate = Ewma(self._thresholds.alpha)
+        self._ratio = Ewma(self._thresholds.alpha)
+        self.problems[ANOMALY_HASHBOARD] = []
+        self.problems[ANOMALY_HASHRATE_DRIFT] = []
+
+    def update(self, sample: dict[str, Any]) -> bool:
+        """Feed one snapshot; return True if any problem state changed."""
+        before = self._states()
+        thresholds = self._thresholds
+
+        elapsed = sample.get("elapsed") or 0
+        rebooted = elapsed < self._elapsed
+        self._elapsed = elapsed
+        if sample.get("soft_off") != "0" or rebooted:
+            # Hashing stopped on purpose; start the baselines over.
+            self._reset_hashrate()
+            self._fans = {key: Ewma(thresholds.alpha) for key in FAN_KEYS}
+            self.problems[ANOMALY_FAN] = []
+            return before != self._states()
+
+        self._update_fans(sample)
+
+        ghs_spd = sample_value(sample.get("ghs_spd"))
+        if ghs_spd is not None:
+            baseline = self._hashrate
+            if baseline.count >= thresholds.warmup and baseline.mean > 0:
+                drop = (baseline.mean - ghs_spd) / baseline.mean
+                if drop >= thresholds.hashboard_drop:
+                    self.problems[ANOMALY_HASHBOARD] = ["ghs_spd"]
+                elif drop < thresholds.hashboard_drop / 2:
+                    self.problems[ANOMALY_HASHBOARD] = []
+            # Freeze the baseline while a dropout is active so it does not
+            # drift down to the degraded rate and clear the problem.
+            if not self.problems[ANOMALY_HASHBOARD]:
+                baseline.update(ghs_spd)
+
+        mhs_5m = sample_value(sample.get("hashrate_5m"))
+        if ghs_spd and mhs_5m is not None:
+            self._ratio.update(mhs_5m / 1000 / ghs_spd)
+            if self._ratio.count >= thresholds.warmup:
+                drifting = self._ratio.mean < thresholds.hashrate_drift_ratio
+                self.problems[ANOMALY_HASHRATE_DRIFT] = (
+                    ["hashrate_5m"] if drifting else []
+                )
+
+        return before != self._states()
+
+    def _states(self) -> dict[str, bool]:
+        return {key: bool(value) for key, value in self.problems.items()}
+
+    def _update_fans(self, sample: dict[str, Any]) -> None:
+        thresholds = self._thresholds
+        failing: list[str] = []
+        for key, baseline in self._fans.items():
+            rpm = sample_value(sample.get(key))
+            if rpm is None:
+                continue
+            # Only fans that have been seen spinning are checked, so models
+            # with fewer fans than Fan1..Fan4 do not report unused slots.
+            if (
+                baseline.count >= thresholds.warmup
+                and baseline.mean >= thresholds.fan_min_rpm
+            ):
+                if rpm < thresholds.fan_min_rpm:
+                    # Dead fan: keep the baseline so the problem persists.
+                    failing.append(key)
+                    continue
+                if baseline.zscore(rpm, baseline.mean * FAN_MIN_STD) < -(
+                    thresholds.fan_zscore
+                ):
+                    failing.append(key)
+            baseline.update(rpm)
+        self.problems[ANOMALY_FAN] = failing
@@ -3,11 +3,23 @@
 from __future__ import annotations
 
 import asyncio
+import ipaddress
 import json
 import re
-from typing import Any
+import socket
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
 
-from .const import LOGGER
+from homeassistant.util.json import JSON_DECODE_EXCEPTIONS, json_loads
+
+from .const import COMMAND_HISTORY, DNS_CACHE_TTL, DNS_NEGATIVE_TTL, LOGGER
+from .fields import parse_mm_fields
+
+if TYPE_CHECKING:
+    from collections.abc import Collection
 
 
 class AvalonMinerApiError(Exception):
@@ -18,11 +30,330 @@ class AvalonMinerApiCommunicationError(AvalonMinerApiError):
     """Exception to indicate a communication error."""
 
 
-def parse_estats_field(mm_id0: str, field_name: str) -> str | None:
-    """Parse a field from the MM ID0 string in ESTATS response."""
-    pattern = rf"{field_name}\[([^\]]+)\]"
-    match = re.search(pattern, mm_id0)
-    return match.group(1) if match else None
+MM_ID_PREFIX = "MM ID"
+
+
+def parse_estats(
+    estats_resp: dict[str, Any], keys: Collection[str] | None = None
+) -> dict[str, Any]:
+    """Parse an ESTATS response into snapshot fields.
+
+    Only the MM ID fields in `keys` are decoded; None decodes all of them.
+    Modules other than MM ID0 are stored under "modules" by module number.
+    """
+    stats_list = estats_resp.get("STATS", [])
+    stats = stats_list[0] if isinstance(stats_list, list) and stats_list else {}
+    data: dict[str, Any] = {}
+    data["elapsed"] = stats.get("Elapsed", 0)
+    mm_id0 = stats.get("MM ID0", "")
+    data["mm_id0"] = mm_id0
+
+    if mm_id0:
+        data.update(parse_mm_fields(mm_id0, keys))
+
+    # Controllers with chained modules report them as MM ID1..MM IDn.
+    modules = {
+        name.removeprefix(MM_ID_PREFIX): parse_mm_fields(mm_id, keys)
+        for name, mm_id in stats.items()
+        if name.startswith(MM_ID_PREFIX) and name != "MM ID0" and mm_id
+    }
+    if modules:
+        data["modules"] = modules
+
+    return data
+
+
+def _share_rate(
+    part: float, accepted: float, rejected: float, stale: float
+) -> float | None:
+    total = accepted + rejected + stale
+    return part / total * 100 if total else None
+
+
+def parse_pools(pools: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
+    """Parse every entry of a POOLS reply into typed per-pool stats.
+
+    Keyed by the pool number. Reject and stale rates are percentages of the
+    submitted difficulty, falling back to share counts on firmware that
+    does not report difficulty totals.
+    """
+    stats: dict[str, dict[str, Any]] = {}
+    for pool in pools:
+        accepted = int(pool.get("Accepted", 0))
+        rejected = int(pool.get("Rejected", 0))
+        stale = int(pool.get("Stale", 0))
+        if "Difficulty Accepted" in pool:
+            weights = (
+                float(pool.get("Difficulty Accepted", 0)),
+                float(pool.get("Difficulty Rejected", 0)),
+                float(pool.get("Difficulty Stale", 0)),
+            )
+        else:
+            weights = (accepted, rejected, stale)
+        last_share = pool.get("Last Share Time")
+        stats[str(pool.get("POOL", len(stats)))] = {
+            "url": pool.get("URL", ""),
+            "status": pool.get("Status", ""),
+            "priority": pool.get("Priority"),
+            "accepted": accepted,
+            "rejected": rejected,
+            "stale": stale,
+            "reject_rate": _share_rate(weights[1], *weights),
+            "stale_rate": _share_rate(weights[2], *weights),
+            "difficulty": pool.get("Last Share Difficulty"),
+            # cgminer reports 0 before the first share.
+            "last_share": (
+                datetime.fromtimestamp(last_share, UTC)
+                if isinstance(last_share, int) and last_share > 0
+                else None
+            ),
+        }
+    return stats
+
+
+# Snapshot keys filled by each optional command. version and estats are always
+# sent: they identify the miner and carry its running state.
+COMMAND_KEYS = {
+    "summary": frozenset(
+        {
+            "hashrate_5s",
+            "hashrate_1m",
+            "hashrate_5m",
+            "hashrate_15m",
+            "accepted_shares",
+            "rejected_shares",
+            "hardware_errors",
+            "best_share",
+            "found_blocks",
+        }
+    ),
+    "pools": frozenset({"pools", "pool_stats"}),
+    "lcd": frozenset({"current_pool", "pool_user"}),
+}
+ALWAYS_SENT_COMMANDS = ("version", "estats")
+
+VERSION_KEYS = frozenset({"model", "dna", "prod", "mac", "firmware"})
+
+# Seconds each command may take, connect to last byte. Commands run in
+# parallel, so the slowest deadline bounds the whole poll.
+COMMAND_DEADLINES = {
+    "version": 5,
+    "estats": 10,
+    "summary": 5,
+    "pools": 5,
+    "lcd": 5,
+}
+DEFAULT_COMMAND_DEADLINE = 10
+
+
+def command_for_key(key: str) -> str:
+    """Return the command whose reply fills a snapshot key."""
+    if key in VERSION_KEYS:
+        return "version"
+    for command, command_keys in COMMAND_KEYS.items():
+        if key in command_keys:
+            return command
+    # elapsed, the MM ID fields and the chained modules.
+    return "estats"
+
+
+def required_commands(
+    keys: Collection[str] | None = None,
+    supported: Collection[str] | None = None,
+) -> list[str]:
+    """Return the commands needed to fill the given snapshot keys.
+
+    Optional commands outside `supported` (None: all supported) are skipped.
+    """
+    commands = list(ALWAYS_SENT_COMMANDS)
+    commands.extend(
+        command
+        for command, command_keys in COMMAND_KEYS.items()
+        if (keys is None or not command_keys.isdisjoint(keys))
+        and (supported is None or command in supported)
+    )
+    return commands
+
+
+# Bytes stripped from the end of a reply before decoding: cgminer terminates
+# replies with NUL, some firmware adds a newline.
+_REPLY_PADDING = b"\x00\r\n\t "
+
+# Known cgminer defects: objects in a list not separated by commas (multi-
+# device STATS replies, group 2) and trailing commas before a closing bracket
+# (group 3). String literals are matched first (group 1) and kept as they
+# are, so pool URLs or worker names containing "}{" or ",}" are never
+# rewritten.
+_DEFECTS = re.compile(rb'("[^"\\]*(?:\\.[^"\\]*)*")|(})\s*{|,\s*([}\]])')
+
+
+def _repair_match(match: re.Match[bytes]) -> bytes:
+    if match[1] is not None:
+        return match[1]
+    return b"},{" if match[2] is not None else match[3]
+
+
+def repair_json(raw: bytes) -> bytes:
+    """Repair the known cgminer JSON defects in a reply.
+
+    Also drops trailing garbage after the last closing brace.
+    """
+    end = raw.rfind(b"}")
+    if end != -1:
+        raw = raw[: end + 1]
+    return _DEFECTS.sub(_repair_match, raw)
+
+
+def decode_response(raw: bytes, source: str) -> dict[str, Any]:
+    """Decode one raw cgminer API reply.
+
+    Valid replies are decoded directly from the bytes; replies that fail
+    are decoded once more after repair_json.
+    """
+    end = len(raw)
+    while end and raw[end - 1] in _REPLY_PADDING:
+        end -= 1
+    reply = memoryview(raw)[:end]
+    try:
+        return json_loads(reply)
+    except JSON_DECODE_EXCEPTIONS:
+        pass
+    try:
+        data = json_loads(repair_json(bytes(reply)))
+    except JSON_DECODE_EXCEPTIONS as exc:
+        msg = f"Invalid JSON response from {source} - {exc}"
+        raise AvalonMinerApiCommunicationError(msg) from exc
+    LOGGER.debug("Repaired malformed JSON response from %s", source)
+    return data
+
+
+def build_snapshot(
+    raw: dict[str, bytes | Exception],
+    keys: Collection[str] | None = None,
+    source: str = "",
+) -> dict[str, Any]:
+    """Decode the raw replies of one poll into a typed snapshot.
+
+    Pure and thread-safe, so it can run in an executor. Failed commands
+    leave their fields out and are listed under "failed_commands"; only a
+    poll where every command failed raises.
+    """
+    results: dict[str, Any] = {}
+    for command, response in raw.items():
+        if isinstance(response, Exception):
+            results[command] = response
+            continue
+        try:
+            results[command] = decode_response(response, source)
+        except AvalonMinerApiError as exc:
+            results[command] = exc
+
+    data: dict[str, Any] = {}
+
+    # Every command failing means the miner is unreachable; otherwise the
+    # snapshot is built from what answered and the caller fills the gaps.
+    failed = [
+        command
+        for command, response in results.items()
+        if isinstance(response, Exception)
+    ]
+    if len(failed) == len(results):
+        raise AvalonMinerApiCommunicationError(
+            f"No reply from {source}: {results['version']}"
+        ) from results["version"]
+    data["failed_commands"] = failed
+
+    # Version
+    version_resp = results["version"]
+    if isinstance(version_resp, Exception):
+        LOGGER.warning("Failed to get version: %s", version_resp)
+    else:
+        ver_list = version_resp.get("VERSION", [])
+        ver = ver_list[0] if isinstance(ver_list, list) and ver_list else {}
+        data["model"] = ver.get("MODEL", "Unknown")
+        data["dna"] = ver.get("DNA", "unknown")
+        data["prod"] = ver.get("PROD", "")
+        data["mac"] = ver.get("MAC", "")
+        data["firmware"] = ver.get(
+            "LVERSION", ver.get("BVERSION", ver.get("CGVERSION", ""))
+        )
+
+    # Summary
+    summary_resp = results.get("summary")
+    if isinstance(summary_resp, Exception):
+        LOGGER.warning("Failed to get summary: %s", summary_resp)
+    elif summary_resp is not None:
+        sum_list = summary_resp.get("SUMMARY", [])
+        summary = sum_list[0] if isinstance(sum_list, list) and sum_list else {}
+        data["hashrate_5s"] = summary.get("MHS 5s", 0)
+        data["hashrate_1m"] = summary.get("MHS 1m", 0)
+        data["hashrate_5m"] = summary.get("MHS 5m", 0)
+        data["hashrate_15m"] = summary.get("MHS 15m", 0)
+        data["accepted_shares"] = summary.get("Accepted", 0)
+        data["rejected_shares"] = summary.get("Rejected", 0)
+        data["hardware_errors"] = summary.get("Hardware Errors", 0)
+        data["best_share"] = summary.get("Best Share", 0)
+        data["found_blocks"] = summary.get("Found Blocks", 0)
+
+    # ESTATS
+    estats_resp = results["estats"]
+    if not isinstance(estats_resp, Exception):
+        data.update(parse_estats(estats_resp, keys))
+    else:
+        LOGGER.warning("Failed to get estats: %s", estats_resp)
+
+    # Pools
+    pools_resp = results.get("pools")
+    if isinstance(pools_resp, Exception):
+        LOGGER.warning("Failed to get pools: %s", pools_resp)
+    elif pools_resp is not None:
+        pools_list = pools_resp.get("POOLS", [])
+        data["pools"] = pools_list
+        data["pool_stats"] = parse_pools(pools_list)
+
+    # LCD
+    lcd_resp = results.get("lcd")
+    if isinstance(lcd_resp, Exception):
+        LOGGER.warning("Failed to get lcd: %s", lcd_resp)
+    elif lcd_resp is not None:
+        lcd_list = lcd_resp.get("LCD", [])
+        lcd = lcd_list[0] if isinstance(lcd_list, list) and lcd_list else {}
+        data["current_pool"] = lcd.get("Current Pool", "")
+        data["pool_user"] = lcd.get("User", "")
+
+    return data
+
+
+@dataclass
+class ClientStats:
+    """Connection-setup counters of one client."""
+
+    resolves: int = 0
+    resolve_cache_hits: int = 0
+    resolve_failures: int = 0
+    # Seconds spent in getaddrinfo, in total and for the latest lookup.
+    resolve_time: float = 0.0
+    last_resolve_time: float = 0.0
+
+
+@dataclass(slots=True)
+class CommandRecord:
+    """One command exchange: when, what, how long, and the raw reply."""
+
+    time: float
+    command: str
+    params: str
+    elapsed: float
+    response: bytes
+    error: str | None
+
+
+def _is_ip_address(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return True
 
 
 class AvalonMinerApiClient:
@@ -32,11 +363,101 @@ class AvalonMinerApiClient:
         self._host = host
         self._port = port
         self._timeout = timeout
+        self.stats = ClientStats()
+        # The latest exchanges, kept as received for diagnostics.
+        self.history: deque[CommandRecord] = deque(maxlen=COMMAND_HISTORY)
+        # IP literals never need resolving; hostnames are cached for
+        # DNS_CACHE_TTL and failed lookups for DNS_NEGATIVE_TTL.
+        self._static_address = _is_ip_address(host)
+        self._address: str | None = host if self._static_address else None
+        self._lookup_error: OSError | None = None
+        self._address_expires = 0.0
+        self._resolve_lock = asyncio.Lock()
+
+    async def _async_resolve(self) -> str:
+        """Return the host's address, resolving it only when the cache expired."""
+        if self._static_address:
+            return self._host
+        async with self._resolve_lock:
+            now = time.monotonic()
+            if now < self._address_expires:
+                self.stats.resolve_cache_hits += 1
+                if self._address is None:
+                    msg = f"Lookup of {self._host} failed: {self._lookup_error}"
+                    raise OSError(msg)
+                return self._address
+
+            start = time.perf_counter()
+            try:
+                infos = await asyncio.get_running_loop().getaddrinfo(
+                    self._host, self._port, type=socket.SOCK_STREAM
+                )
+            except OSError as exc:
+                self.stats.resolve_failures += 1
+                self._address, self._lookup_error = None, exc
+                self._address_expires = now + DNS_NEGATIVE_TTL
+                raise
+            finally:
+                elapsed = time.perf_counter() - start
+                self.stats.resolves += 1
+                self.stats.resolve_time += elapsed
+                self.stats.last_resolve_time = elapsed
+
+            self._address, self._lookup_error = infos[0][4][0], None
+            self._address_expires = now + DNS_CACHE_TTL
+            LOGGER.debug(
+                "Resolved %s to %s in %.3f s", self._host, self._address, elapsed
+            )
+            return self._address
+
+    def _invalidate_address(self) -> None:
+        """Forget the cached address after a connection failure."""
+        if not self._static_address and self._lookup_error is None:
+            self._address_expires = 0.0
+
+    async def _async_open_connection(
+        self,
+    ) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        """Open a connection to the cached address of the host."""
+        return await asyncio.open_connection(await self._async_resolve(), self._port)
+
+    @property
+    def source(self) -> str:
+        """Return host:port for messages."""
+        return f"{self._host}:{self._port}"
+
+    async def async_read_command(self, command: str, params: str = "") -> bytes:
+        """Send a command to the miner API and return the undecoded reply.
+
+        Every exchange is recorded in the `history` ring buffer.
+        """
+        started = time.time()
+        start = time.monotonic()
+        response = b""
+        error: str | None = None
+        try:
+            response = await self._async_exchange(command, params)
+        except AvalonMinerApiError as exc:
+            error = str(exc)
+            raise
+        except asyncio.CancelledError:
+            error = "Cancelled"
+            raise
+        finally:
+            self.history.append(
+                CommandRecord(
+                    started,
+                    command,
+                    params,
+                    time.monotonic() - start,
+                    response,
+                    error,
+                )
+            )
+        return response
 
-    async def async_send_command(
-        self, command: str, params: str = ""
-    ) -> dict[str, Any]:
-        """Send a command to the miner API via async TCP."""
+    async def _async_exchange(self, command: str, params: str) -> bytes:
+        """Send one command over a new connection and read the reply."""
         if params:
             json_cmd = json.dumps(
                 {"command": command, "parameter": params}, separators=(",", ":")
@@ -46,7 +467,7 @@ class AvalonMinerApiClient:
 
         try:
             reader, writer = await asyncio.wait_for(
-                asyncio.open_connection(self._host, self._port),
+                self._async_open_connection(),
                 timeout=self._timeout,
             )
 
@@ -71,24 +492,47 @@ class AvalonMinerApiClient:
             except Exception:
                 pass
 
-            response_str = response.decode("utf-8").rstrip("\x00").strip()
-            return json.loads(response_str)
+            return response
 
         except asyncio.TimeoutError as exc:
+            self._invalidate_address()
             msg = f"Timeout connecting to {self._host}:{self._port}"
             raise AvalonMinerApiCommunicationError(msg) from exc
         except OSError as exc:
+            self._invalidate_address()
             msg = f"Error communicating with {self._host}:{self._port} - {exc}"
             raise AvalonMinerApiCommunicationError(msg) from exc
-        except json.JSONDecodeError as exc:
-            msg = f"Invalid JSON response from {self._host}:{self._port} - {exc}"
-            raise AvalonMinerApiCommunicationError(msg) from exc
         except AvalonMinerApiError:
             raise
         except Exception as exc:
             msg = f"Unexpected error communicating with miner: {exc}"
             raise AvalonMinerApiError(msg) from exc
 
+    async def async_send_command(
+        self, command: str, params: str = ""
+    ) -> dict[str, Any]:
+        """Send a command to the miner API via async TCP."""
+        return decode_response(
+            await self.async_read_command(command, params), self.source
+        )
+
+    async def async_probe(self, timeout: float) -> None:
+        """Check that the API port accepts TCP connections."""
+        try:
+            _, writer = await asyncio.wait_for(
+                self._async_open_connection(),
+                timeout=timeout,
+            )
+        except (asyncio.TimeoutError, OSError) as exc:
+            self._invalidate_address()
+            msg = f"No answer from {self._host}:{self._port}"
+            raise AvalonMinerApiCommunicationError(msg) from exc
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except Exception:
+            pass
+
     async def async_get_version(self) -> dict[str, Any]:
         """Get miner version information."""
         return await self.async_send_command("version")
@@ -101,6 +545,12 @@ class AvalonMinerApiClient:
         """Get extended miner statistics."""
         return await self.async_send_command("estats")
 
+    async def async_get_estats_data(
+        self, keys: Collection[str] | None = None
+    ) -> dict[str, Any]:
+        """Get parsed extended statistics (work mode, soft-off, temps...)."""
+        return parse_estats(await self.async_get_estats(), keys)
+
     async def async_get_pools(self) -> dict[str, Any]:
         """Get pool information."""
         return await self.async_send_command("pools")
@@ -109,109 +559,45 @@ class AvalonMinerApiClient:
         """Get LCD/active pool information."""
         return await self.async_send_command("lcd")
 
-    async def async_fetch_all_data(self) -> dict[str, Any]:
-        """Fetch all data from the miner in parallel."""
-        version_task = self.async_get_version()
-        summary_task = self.async_get_summary()
-        estats_task = self.async_get_estats()
-        pools_task = self.async_get_pools()
-        lcd_task = self.async_get_lcd()
-
-        results = await asyncio.gather(
-            version_task, summary_task, estats_task, pools_task, lcd_task,
+    async def async_fetch_raw(
+        self,
+        keys: Collection[str] | None = None,
+        supported_commands: Collection[str] | None = None,
+    ) -> dict[str, bytes | Exception]:
+        """Send the commands needed for `keys` in parallel, without decoding.
+
+        Commands outside `supported_commands` are never sent.
+        """
+        commands = required_commands(keys, supported_commands)
+        responses = await asyncio.gather(
+            *(self._async_read_within_deadline(command) for command in commands),
             return_exceptions=True,
         )
+        return dict(zip(commands, responses))
 
-        data: dict[str, Any] = {}
-
-        # Version
-        version_resp = results[0]
-        if isinstance(version_resp, Exception):
-            raise AvalonMinerApiCommunicationError(
-                f"Failed to get version: {version_resp}"
-            ) from version_resp
-        ver_list = version_resp.get("VERSION", [])
-        ver = ver_list[0] if isinstance(ver_list, list) and ver_list else {}
-        data["model"] = ver.get("MODEL", "Unknown")
-        data["dna"] = ver.get("DNA", "unknown")
-        data["prod"] = ver.get("PROD", "")
-        data["mac"] = ver.get("MAC", "")
-        data["firmware"] = ver.get(
-            "LVERSION", ver.get("BVERSION", ver.get("CGVERSION", ""))
-        )
-
-        # Summary
-        summary_resp = results[1]
-        if not isinstance(summary_resp, Exception):
-            sum_list = summary_resp.get("SUMMARY", [])
-            summary = (
-                sum_list[0] if isinstance(sum_list, list) and sum_list else {}
-            )
-            data["hashrate_5s"] = summary.get("MHS 5s", 0)
-            data["hashrate_1m"] = summary.get("MHS 1m", 0)
-            data["hashrate_5m"] = summary.get("MHS 5m", 0)
-            data["hashrate_15m"] = summary.get("MHS 15m", 0)
-            data["accepted_shares"] = summary.get("Accepted", 0)
-            data["rejected_shares"] = summary.get("Rejected", 0)
-            data["hardware_errors"] = summary.get("Hardware Errors", 0)
-            data["best_share"] = summary.get("Best Share", 0)
-            data["found_blocks"] = summary.get("Found Blocks", 0)
-        else:
-            LOGGER.warning("Failed to get summary: %s", summary_resp)
-
-        # ESTATS
-        estats_resp = results[2]
-        if not isinstance(estats_resp, Exception):
-            stats_list = estats_resp.get("STATS", [])
-            stats = (
-                stats_list[0]
-                if isinstance(stats_list, list) and stats_list
-                else {}
-            )
-            data["elapsed"] = stats.get("Elapsed", 0)
-            mm_id0 = stats.get("MM ID0", "")
-            data["mm_id0"] = mm_id0
-
-            if mm_id0:
-                data["soft_off"] = parse_estats_field(mm_id0, "SoftOFF")
-                data["work_mode"] = parse_estats_field(mm_id0, "WORKMODE")
-                data["temp_avg"] = parse_estats_field(mm_id0, "TAvg")
-                data["temp_max"] = parse_estats_field(mm_id0, "TMax")
-                data["temp_inlet"] = parse_estats_field(mm_id0, "ITemp")
-                data["temp_target"] = parse_estats_field(mm_id0, "TarT")
-                data["temp_hb_inlet"] = parse_estats_field(mm_id0, "HBITemp")
-                data["temp_hb_outlet"] = parse_estats_field(mm_id0, "HBOTemp")
-                data["fan_speed_pct"] = parse_estats_field(mm_id0, "FanR")
-                data["fan1_rpm"] = parse_estats_field(mm_id0, "Fan1")
-                data["fan2_rpm"] = parse_estats_field(mm_id0, "Fan2")
-                data["fan3_rpm"] = parse_estats_field(mm_id0, "Fan3")
-                data["fan4_rpm"] = parse_estats_field(mm_id0, "Fan4")
-                data["power_output"] = parse_estats_field(mm_id0, "MPO")
-                data["ghs_avg"] = parse_estats_field(mm_id0, "GHSavg")
-                data["ghs_spd"] = parse_estats_field(mm_id0, "GHSspd")
-        else:
-            LOGGER.warning("Failed to get estats: %s", estats_resp)
+    async def _async_read_within_deadline(self, command: str) -> bytes:
+        """Read one command, giving up after its entry in COMMAND_DEADLINES."""
+        deadline = COMMAND_DEADLINES.get(command, DEFAULT_COMMAND_DEADLINE)
+        try:
+            async with asyncio.timeout(deadline):
+                return await self.async_read_command(command)
+        except TimeoutError as exc:
+            msg = f"{command} took longer than {deadline} s on {self.source}"
+            raise AvalonMinerApiCommunicationError(msg) from exc
 
-        # Pools
-        pools_resp = results[3]
-        if not isinstance(pools_resp, Exception):
-            pools_list = pools_resp.get("POOLS", [])
-            data["pools"] = pools_list
-        else:
-            LOGGER.warning("Failed to get pools: %s", pools_resp)
-            data["pools"] = []
-
-        # LCD
-        lcd_resp = results[4]
-        if not isinstance(lcd_resp, Exception):
-            lcd_list = lcd_resp.get("LCD", [])
-            lcd = lcd_list[0] if isinstance(lcd_list, list) and lcd_list else {}
-            data["current_pool"] = lcd.get("Current Pool", "")
-            data["pool_user"] = lcd.get("User", "")
-        else:
-            LOGGER.warning("Failed to get lcd: %s", lcd_resp)
+    async def async_fetch_all_data(
+        self,
+        keys: Collection[str] | None = None,
+        supported_commands: Collection[str] | None = None,
+    ) -> dict[str, Any]:
+        """Fetch all data from the miner in parallel and decode it inline.
 
-        return data
+        `keys` limits which commands are sent and which MM ID0 fields are
+        decoded (None fetches and decodes everything); commands outside
+        `supported_commands` are never sent.
+        """
+        raw = await self.async_fetch_raw(keys, supported_commands)
+        return build_snapshot(raw, keys, self.source)
 
     async def async_set_fan_speed(self, value: int) -> None:
         """Set fan speed. 0 = Auto, 25-100 = fixed percentage."""
@@ -229,6 +615,14 @@ class AvalonMinerApiClient:
         """Set target temperature (50-90)."""
         await self.async_send_command("ascset", f"0,target-temp,{temp}")
 
+    async def async_soft_off(self) -> None:
+        """Put the miner into soft-off (hashing stopped, controller stays up)."""
+        await self.async_send_command("ascset", f"0,softoff,1:{int(time.time())}")
+
+    async def async_soft_on(self) -> None:
+        """Resume hashing after a soft-off."""
+        await self.async_send_command("ascset", f"0,softon,1:{int(time.time())}")
+
     async def async_reboot(self) -> None:
         """Reboot the miner."""
         await self.async_send_command("ascset", "0,reboot,0")
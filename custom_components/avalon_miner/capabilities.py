@@ -0,0 +1,146 @@
+"""Per-model capability probing and cache for avalon_miner."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.helpers.storage import Store
+
+from .anomaly import FAN_KEYS
+from .api import COMMAND_KEYS, parse_estats
+from .const import DOMAIN, LOGGER
+from .fields import MM_FIELDS, count_fans
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .api import AvalonMinerApiClient
+
+STORAGE_KEY = f"{DOMAIN}.capabilities"
+STORAGE_VERSION = 1
+
+DATA_CAPABILITY_CACHE = f"{DOMAIN}_capability_cache"
+
+
+@dataclass(frozen=True)
+class Capabilities:
+    """What one (model, firmware) combination supports."""
+
+    commands: frozenset[str]
+    fields: frozenset[str]
+    # Number of Fan1..FanN tags in MM ID0.
+    fan_count: int
+    # False when probed while soft-off (sensors may read as absent) or when
+    # a command failed to answer: the result is used for this setup only
+    # and not cached.
+    complete: bool = True
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable representation."""
+        data = asdict(self)
+        data["commands"] = sorted(self.commands)
+        data["fields"] = sorted(self.fields)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Capabilities:
+        """Create from the stored representation."""
+        return cls(
+            commands=frozenset(data["commands"]),
+            fields=frozenset(data["fields"]),
+            fan_count=data.get(
+                "fan_count", sum(1 for key in FAN_KEYS if key in data["fields"])
+            ),
+            complete=data.get("complete", True),
+        )
+
+
+def _command_supported(response: Any) -> bool:
+    """Return False only for an explicit cgminer error reply."""
+    if isinstance(response, Exception):
+        return True
+    status = response.get("STATUS")
+    if isinstance(status, list) and status:
+        return status[0].get("STATUS") != "E"
+    return True
+
+
+async def async_probe_capabilities(client: AvalonMinerApiClient) -> Capabilities:
+    """Send every optional command once and decode every MM ID0 field.
+
+    Fields that are missing or report the -273 sentinel count as absent.
+    The fan count is taken from the Fan1..FanN tags, which are reported
+    while soft-off as well, so fans beyond it are never assumed present.
+    A command that times out or fails to connect is assumed supported, and
+    the result is marked incomplete so it is not cached.
+
+    Raises AvalonMinerApiError if the miner does not answer estats.
+    """
+    commands = list(COMMAND_KEYS)
+    responses = await asyncio.gather(
+        *(client.async_send_command(command) for command in commands),
+        return_exceptions=True,
+    )
+    estats = parse_estats(await client.async_get_estats())
+
+    answered = not any(isinstance(response, Exception) for response in responses)
+    hashing = estats.get("soft_off") == "0"
+    fan_count = count_fans(estats["mm_id0"])
+    absent_fans = set(FAN_KEYS[fan_count:]) if estats["mm_id0"] else set()
+    fields = frozenset(
+        mm_field.key
+        for mm_field in MM_FIELDS
+        if (not hashing or estats.get(mm_field.key) is not None)
+        and mm_field.key not in absent_fans
+    )
+    return Capabilities(
+        commands=frozenset(
+            command
+            for command, response in zip(commands, responses)
+            if _command_supported(response)
+        ),
+        fields=fields,
+        fan_count=fan_count,
+        complete=hashing and answered,
+    )
+
+
+class CapabilityCache:
+    """Capabilities per (model, firmware), persisted in .storage."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the cache."""
+        self._store: Store[dict[str, dict[str, Any]]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY
+        )
+        self._data: dict[str, dict[str, Any]] | None = None
+        self._lock = asyncio.Lock()
+
+    async def async_get(
+        self, client: AvalonMinerApiClient, model: str, firmware: str
+    ) -> Capabilities:
+        """Return cached capabilities, probing the miner on a cache miss."""
+        key = f"{model}|{firmware}"
+        async with self._lock:
+            if self._data is None:
+                self._data = await self._store.async_load() or {}
+            if (stored := self._data.get(key)) is not None:
+                return Capabilities.from_dict(stored)
+
+        capabilities = await async_probe_capabilities(client)
+        LOGGER.debug("Probed capabilities of %s: %s", key, capabilities)
+        if capabilities.complete:
+            self._data[key] = capabilities.as_dict()
+            await self._store.async_save(self._data)
+        return capabilities
+
+
+async def async_get_capabilities(
+    hass: HomeAssistant, client: AvalonMinerApiClient, model: str, firmware: str
+) -> Capabilities:
+    """Return the capabilities of a miner from the shared cache."""
+    if (cache := hass.data.get(DATA_CAPABILITY_CACHE)) is None:
+        cache = hass.data[DATA_CAPABILITY_CACHE] = CapabilityCache(hass)
+    return await cache.async_get(client, model, firmware)
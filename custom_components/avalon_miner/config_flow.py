@@ -7,15 +7,36 @@ from typing import Any
 import voluptuous as vol
 from homeassistant import config_entries, exceptions
 from homeassistant.const import CONF_HOST
+from homeassistant.core import callback
+from homeassistant.helpers import selector
 
 from .api import AvalonMinerApiClient, AvalonMinerApiCommunicationError
 from .const import (
+    CONF_HASHPRICE,
+    CONF_HEARTBEAT_INTERVAL,
+    CONF_LONG_TERM_STATISTICS,
+    CONF_MIN_DWELL,
+    CONF_OFFLOAD_PARSING,
     CONF_POLLING_INTERVAL,
     CONF_PORT,
+    CONF_PRICE_ENTITY,
+    CONF_PRICE_FORECAST_ATTRIBUTE,
+    CONF_PUBLISH_INTERVAL,
+    CONF_SCHEDULER_MODE,
+    CONF_STALE_THRESHOLD,
+    DEFAULT_HASHPRICE,
+    DEFAULT_HEARTBEAT_INTERVAL,
+    DEFAULT_LONG_TERM_STATISTICS,
+    DEFAULT_MIN_DWELL,
+    DEFAULT_OFFLOAD_PARSING,
     DEFAULT_PORT,
+    DEFAULT_PUBLISH_INTERVAL,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_SCHEDULER_MODE,
+    DEFAULT_STALE_THRESHOLD,
     DOMAIN,
     LOGGER,
+    SCHEDULER_MODE_OPTIONS,
 )
 
 STEP_USER_DATA_SCHEMA = vol.Schema(
@@ -43,6 +64,14 @@ class HeaterControlConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self._port: int | None = None
         self._interval: int | None = None
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> AvalonMinerOptionsFlow:
+        """Get the options flow for this handler."""
+        return AvalonMinerOptionsFlow()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> config_entries.ConfigFlowResult:
@@ -80,32 +109,135 @@ class HeaterControlConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             errors=errors,
         )
 
+    async def async_step_import(
+        self, import_data: dict[str, Any]
+    ) -> config_entries.ConfigFlowResult:
+        """Create an entry for a miner validated by the inventory import."""
+        await self.async_set_unique_id(import_data["dna"])
+        self._abort_if_unique_id_configured()
+        return self.async_create_entry(
+            title=f"{import_data['model']} ({import_data['dna']})",
+            data=import_data,
+        )
+
     async def _validate_and_setup(self) -> dict:
         """Validate the host and return device info."""
-        client = AvalonMinerApiClient(
-            host=self._host,
-            port=self._port,
-        )
+        return await async_validate_host(self._host, self._port)
+
+
+async def async_validate_host(host: str, port: int) -> dict[str, str]:
+    """Read the version of a miner and return its DNA, model and firmware.
+
+    Raises CannotConnect if the miner does not answer or reports no DNA.
+    """
+    client = AvalonMinerApiClient(host=host, port=port)
+
+    try:
+        version_resp = await client.async_get_version()
+    except AvalonMinerApiCommunicationError as exc:
+        raise CannotConnect from exc
+
+    ver_list = version_resp.get("VERSION", [])
+    if not ver_list:
+        raise CannotConnect
+
+    ver = ver_list[0] if isinstance(ver_list, list) else ver_list
+    dna = ver.get("DNA", "")
+    if not dna:
+        raise CannotConnect
 
-        try:
-            version_resp = await client.async_get_version()
-        except AvalonMinerApiCommunicationError as exc:
-            raise CannotConnect from exc
-
-        ver_list = version_resp.get("VERSION", [])
-        if not ver_list:
-            raise CannotConnect
-
-        ver = ver_list[0] if isinstance(ver_list, list) else ver_list
-        dna = ver.get("DNA", "")
-        if not dna:
-            raise CannotConnect
-
-        return {
-            "dna": dna,
-            "model": ver.get("MODEL", "Unknown"),
-            "firmware": ver.get(
-                "LVERSION",
-                ver.get("BVERSION", ver.get("CGVERSION", "")),
+    return {
+        "dna": dna,
+        "model": ver.get("MODEL", "Unknown"),
+        "firmware": ver.get(
+            "LVERSION",
+            ver.get("BVERSION", ver.get("CGVERSION", "")),
+        ),
+    }
+
+
+class AvalonMinerOptionsFlow(config_entries.OptionsFlow):
+    """Handle options for avalon_miner."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> config_entries.ConfigFlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_HEARTBEAT_INTERVAL,
+                        default=options.get(
+                            CONF_HEARTBEAT_INTERVAL, DEFAULT_HEARTBEAT_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=300)),
+                    vol.Required(
+                        CONF_PUBLISH_INTERVAL,
+                        default=options.get(
+                            CONF_PUBLISH_INTERVAL, DEFAULT_PUBLISH_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+                    vol.Required(
+                        CONF_LONG_TERM_STATISTICS,
+                        default=options.get(
+                            CONF_LONG_TERM_STATISTICS, DEFAULT_LONG_TERM_STATISTICS
+                        ),
+                    ): bool,
+                    vol.Required(
+                        CONF_OFFLOAD_PARSING,
+                        default=options.get(
+                            CONF_OFFLOAD_PARSING, DEFAULT_OFFLOAD_PARSING
+                        ),
+                    ): bool,
+                    vol.Required(
+                        CONF_STALE_THRESHOLD,
+                        default=options.get(
+                            CONF_STALE_THRESHOLD, DEFAULT_STALE_THRESHOLD
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+                    vol.Required(
+                        CONF_SCHEDULER_MODE,
+                        default=options.get(
+                            CONF_SCHEDULER_MODE, DEFAULT_SCHEDULER_MODE
+                        ),
+                    ): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=SCHEDULER_MODE_OPTIONS,
+                            translation_key=CONF_SCHEDULER_MODE,
+                        )
+                    ),
+                    vol.Optional(
+                        CONF_PRICE_ENTITY,
+                        description={
+                            "suggested_value": options.get(CONF_PRICE_ENTITY)
+                        },
+                    ): selector.EntitySelector(
+                        selector.EntitySelectorConfig(
+                            domain=["sensor", "input_number"]
+                        )
+                    ),
+                    vol.Optional(
+                        CONF_PRICE_FORECAST_ATTRIBUTE,
+                        description={
+                            "suggested_value": options.get(
+                                CONF_PRICE_FORECAST_ATTRIBUTE
+                            )
+                        },
+                    ): str,
+                    vol.Required(
+                        CONF_HASHPRICE,
+                        default=options.get(CONF_HASHPRICE, DEFAULT_HASHPRICE),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                    vol.Required(
+                        CONF_MIN_DWELL,
+                        default=options.get(CONF_MIN_DWELL, DEFAULT_MIN_DWELL),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=1440)),
+                }
             ),
-        }
+        )
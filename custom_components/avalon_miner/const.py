@@ -6,13 +6,106 @@ LOGGER: Logger = getLogger(__package__)
 
 DOMAIN = "avalon_miner"
 TITLE = "Avalon Miner"
+EVENT_AVALON_MINER = f"{DOMAIN}_event"
+# Dispatched with (dna, sample) for every raw sample, before windowing.
+SIGNAL_SAMPLE = f"{DOMAIN}_sample"
 MANUFACTURER = "Canaan"
 
 DEFAULT_PORT = 4028
 DEFAULT_SCAN_INTERVAL = 30
 
+# Seconds a resolved miner hostname, or a failed lookup, is cached.
+DNS_CACHE_TTL = 300
+DNS_NEGATIVE_TTL = 30
+
+# Raw command exchanges kept per miner for diagnostics.
+COMMAND_HISTORY = 50
+
 CONF_PORT = "port"
 CONF_POLLING_INTERVAL = "polling_interval"
+CONF_HEARTBEAT_INTERVAL = "heartbeat_interval"
+CONF_PUBLISH_INTERVAL = "publish_interval"
+CONF_LONG_TERM_STATISTICS = "long_term_statistics"
+CONF_OFFLOAD_PARSING = "offload_parsing"
+CONF_STALE_THRESHOLD = "stale_threshold"
+CONF_SCHEDULER_MODE = "scheduler_mode"
+CONF_PRICE_ENTITY = "price_entity"
+CONF_PRICE_FORECAST_ATTRIBUTE = "price_forecast_attribute"
+CONF_HASHPRICE = "hashprice"
+CONF_MIN_DWELL = "min_dwell"
+
+DEFAULT_HEARTBEAT_INTERVAL = 5
+HEARTBEAT_TIMEOUT = 2
+# Consecutive failed probes before the miner is reported unavailable.
+HEARTBEAT_FAILURES = 2
+
+# 0 publishes every sample.
+DEFAULT_PUBLISH_INTERVAL = 0
+
+DEFAULT_LONG_TERM_STATISTICS = False
+STATISTICS_FLUSH_INTERVAL = 300
+
+# Off: decode replies on the event loop. On: batch them into a worker thread.
+DEFAULT_OFFLOAD_PARSING = False
+# Seconds replies from different miners are collected into one batch.
+PARSE_BATCH_DELAY = 0.05
+
+# Seconds a field carried forward from an earlier poll stays usable.
+DEFAULT_STALE_THRESHOLD = 120
+
+SCHEDULER_MODE_OFF = "off"
+SCHEDULER_MODE_DRY_RUN = "dry_run"
+SCHEDULER_MODE_ACTIVE = "active"
+SCHEDULER_MODE_OPTIONS = [
+    SCHEDULER_MODE_OFF,
+    SCHEDULER_MODE_DRY_RUN,
+    SCHEDULER_MODE_ACTIVE,
+]
+DEFAULT_SCHEDULER_MODE = SCHEDULER_MODE_OFF
+# Currency per TH/s per day, in the currency of the price entity.
+DEFAULT_HASHPRICE = 0.05
+# Minutes a work mode is kept before the scheduler may change it again.
+DEFAULT_MIN_DWELL = 60
+# Seconds between scheduler evaluations besides price changes.
+SCHEDULER_INTERVAL = 300
+# Seconds after a mode change before samples count towards its estimate.
+MODE_SETTLE_TIME = 600
+
+# Seconds the boot time derived from Elapsed may drift before it is moved.
+BOOT_TIME_TOLERANCE = 60
+
+# Snapshot keys read on every poll regardless of the enabled entities:
+# availability, transition events and the fleet services rely on them.
+CORE_KEYS = frozenset({"soft_off", "work_mode"})
+
+# Snapshot keys published as the mean over the publish window.
+WINDOWED_KEYS = (
+    "hashrate_5s",
+    "hashrate_1m",
+    "ghs_avg",
+    "ghs_spd",
+    "temp_avg",
+    "temp_max",
+    "temp_inlet",
+    "temp_hb_inlet",
+    "temp_hb_outlet",
+    "fan1_rpm",
+    "fan2_rpm",
+    "fan3_rpm",
+    "fan4_rpm",
+    "power_output",
+)
+
+# Fields streamed by avalon_miner/subscribe when none are requested.
+STREAM_FIELDS = (
+    *WINDOWED_KEYS,
+    "hashrate_5m",
+    "fan_speed_pct",
+    "soft_off",
+    "work_mode",
+)
+# Seconds deltas are coalesced before they are sent to a subscriber.
+STREAM_FLUSH_INTERVAL = 1.0
 
 WORK_MODE_MAP = {
     "0": "Eco",
@@ -21,3 +114,50 @@ WORK_MODE_MAP = {
 }
 
 WORK_MODE_REVERSE_MAP = {v: k for k, v in WORK_MODE_MAP.items()}
+
+SERVICE_CURTAIL = "curtail"
+SERVICE_RESTORE = "restore"
+SERVICE_ROLLING_REBOOT = "rolling_reboot"
+SERVICE_APPLY_SETTINGS = "apply_settings"
+SERVICE_PROFILE = "profile"
+SERVICE_IMPORT_INVENTORY = "import_inventory"
+SERVICE_TUNE = "tune"
+
+ATTR_MODE = "mode"
+ATTR_DEADLINE = "deadline"
+ATTR_MAX_PARALLEL = "max_parallel"
+ATTR_BATCH_SIZE = "batch_size"
+ATTR_BATCH_DELAY = "batch_delay"
+ATTR_RECOVERY_TIMEOUT = "recovery_timeout"
+ATTR_MIN_HASHRATE = "min_hashrate"
+ATTR_MAX_FAILURES = "max_failures"
+ATTR_WORK_MODE = "work_mode"
+ATTR_TARGET_TEMP = "target_temp"
+ATTR_FAN_SPEED = "fan_speed"
+ATTR_CYCLES = "cycles"
+ATTR_PATH = "path"
+ATTR_WORK_MODES = "work_modes"
+ATTR_TARGET_TEMPS = "target_temps"
+ATTR_SETTLE_TIME = "settle_time"
+ATTR_WINDOW = "window"
+ATTR_MAX_TEMP = "max_temp"
+ATTR_POWER_LIMIT = "power_limit"
+ATTR_REMEASURE = "remeasure"
+
+CURTAIL_MODE_OFF = "off"
+
+DEFAULT_FLEET_DEADLINE = 30
+DEFAULT_MAX_PARALLEL = 50
+DEFAULT_BATCH_SIZE = 5
+DEFAULT_BATCH_DELAY = 60
+DEFAULT_RECOVERY_TIMEOUT = 600
+DEFAULT_MIN_HASHRATE = 80
+DEFAULT_MAX_FAILURES = 1
+DEFAULT_PROFILE_CYCLES = 3
+DEFAULT_IMPORT_PARALLEL = 64
+# Seconds a host may take to answer `version` during an inventory import.
+IMPORT_HOST_TIMEOUT = 5
+DEFAULT_TUNE_TARGET_TEMPS = [70, 80]
+DEFAULT_SETTLE_TIME = 600
+DEFAULT_TUNE_WINDOW = 300
+DEFAULT_TUNE_MAX_TEMP = 85
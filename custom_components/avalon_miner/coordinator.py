@@ -2,24 +2,80 @@
 
 from __future__ import annotations
 
+import random
+import time
+from datetime import timedelta
 from typing import TYPE_CHECKING, Any
 
+from homeassistant.core import callback
+from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import issue_registry as ir
 from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import (
+    async_call_later,
+    async_track_time_interval,
+)
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
 )
+from homeassistant.util import dt as dt_util
 
 from homeassistant.const import CONF_HOST
 
-from .api import AvalonMinerApiError
-from .const import CONF_PORT, DEFAULT_PORT, DOMAIN, MANUFACTURER
+from .anomaly import AnomalyMonitor, thresholds_for_model
+from .api import COMMAND_KEYS, AvalonMinerApiError, command_for_key
+from .capabilities import Capabilities, async_get_capabilities
+from .events import POOL_EVENT_KEYS, diff_snapshots
+from .fields import MM_FIELD_KEYS
+from .const import (
+    BOOT_TIME_TOLERANCE,
+    CONF_HEARTBEAT_INTERVAL,
+    CONF_LONG_TERM_STATISTICS,
+    CONF_OFFLOAD_PARSING,
+    CONF_PORT,
+    CONF_PRICE_ENTITY,
+    CONF_PUBLISH_INTERVAL,
+    CONF_SCHEDULER_MODE,
+    CONF_STALE_THRESHOLD,
+    CORE_KEYS,
+    DEFAULT_HEARTBEAT_INTERVAL,
+    DEFAULT_LONG_TERM_STATISTICS,
+    DEFAULT_OFFLOAD_PARSING,
+    DEFAULT_PORT,
+    DEFAULT_PUBLISH_INTERVAL,
+    DEFAULT_SCHEDULER_MODE,
+    DEFAULT_STALE_THRESHOLD,
+    DOMAIN,
+    EVENT_AVALON_MINER,
+    HEARTBEAT_FAILURES,
+    HEARTBEAT_TIMEOUT,
+    LOGGER,
+    MANUFACTURER,
+    SCHEDULER_MODE_OFF,
+    SIGNAL_SAMPLE,
+    WINDOWED_KEYS,
+)
+from .long_term_statistics import STATISTICS_KEYS, LongTermStatistics
+from .metrics import DATA_METRICS_SCRAPED, METRICS_KEYS
+from .parsing import BatchParser, async_get_batch_parser
+from .sampling import SampleWindow
+from .scheduler import PROFILE_KEYS, MinerScheduler
+from .tuning import TUNING_KEYS
+from .websocket_api import async_subscribed_fields
 
 if TYPE_CHECKING:
+    from datetime import datetime
+
     from homeassistant.core import HomeAssistant
 
     from .data import AvalonMinerConfigEntry
 
+CURTAIL_STORAGE_VERSION = 1
+
 
 class AvalonMinerDataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching data from the API."""
@@ -36,9 +92,57 @@ class AvalonMinerDataUpdateCoordinator(DataUpdateCoordinator):
     ):
         self.entry = entry
         self.device = entry.data["dna"]
+        # State captured by the first curtail, consumed by restore. Persisted
+        # so a reload or restart does not lose what to restore.
+        self.curtail_state: dict[str, Any] | None = None
+        self._curtail_store: Store[dict[str, Any]] = Store(
+            hass, CURTAIL_STORAGE_VERSION, f"{DOMAIN}.curtail.{self.device.lower()}"
+        )
+        self._probing = False
+        self._probe_failures = 0
+        self._probe_marked_down = False
+        # Latest raw sample; self.data holds what was last published.
+        self.sample: dict[str, Any] | None = None
+        self._publish_interval = entry.options.get(
+            CONF_PUBLISH_INTERVAL, DEFAULT_PUBLISH_INTERVAL
+        )
+        self._next_publish = 0.0
+        self._window = SampleWindow(WINDOWED_KEYS)
+        self.capabilities: Capabilities | None = None
+        # Duration of the latest successful poll and count of failed polls.
+        self.poll_duration: float | None = None
+        self.poll_errors = 0
+        self._boot_time: datetime | None = None
+        # Monotonic time each snapshot key was last read fresh from the miner.
+        self._field_updated: dict[str, float] = {}
+        self._stale_threshold = entry.options.get(
+            CONF_STALE_THRESHOLD, DEFAULT_STALE_THRESHOLD
+        )
+        self.parser: BatchParser | None = None
+        if entry.options.get(CONF_OFFLOAD_PARSING, DEFAULT_OFFLOAD_PARSING):
+            self.parser = async_get_batch_parser(hass)
+        self.anomalies = AnomalyMonitor(thresholds_for_model(entry.data["model"]))
+        self.statistics: LongTermStatistics | None = None
+        if "recorder" in hass.config.components and entry.options.get(
+            CONF_LONG_TERM_STATISTICS, DEFAULT_LONG_TERM_STATISTICS
+        ):
+            self.statistics = LongTermStatistics(hass, entry)
+        # Listeners are only notified when the published data changes, so
+        # samples taken between publishes cause no state writes.
         super().__init__(
-            hass, logger=logger, name=name, update_interval=update_interval
+            hass,
+            logger=logger,
+            name=name,
+            update_interval=update_interval,
+            always_update=False,
         )
+        self.scheduler: MinerScheduler | None = None
+        if entry.options.get(
+            CONF_SCHEDULER_MODE, DEFAULT_SCHEDULER_MODE
+        ) != SCHEDULER_MODE_OFF and entry.options.get(CONF_PRICE_ENTITY):
+            self.scheduler = MinerScheduler(self)
+        # Set while the tuner steps this miner through its settings.
+        self.tuning = False
 
     @property
     def device_is_running(self) -> bool:
@@ -61,24 +165,294 @@ class AvalonMinerDataUpdateCoordinator(DataUpdateCoordinator):
             configuration_url=f"http://{host}:{port}",
         )
 
+    def module_device_info(self, module: str) -> DeviceInfo:
+        """Return the sub-device of a chained module (MM ID1..n)."""
+        return DeviceInfo(
+            identifiers={(DOMAIN, f"{self.device}_mm{module}")},
+            name=f"{MANUFACTURER} {self.entry.data['model']} Module {module}",
+            manufacturer=MANUFACTURER,
+            model=self.entry.data["model"],
+            via_device=(DOMAIN, self.device),
+        )
+
+    @callback
+    def async_start_heartbeat(self) -> None:
+        """Start the liveness probe that runs between full polls."""
+        interval = self.entry.options.get(
+            CONF_HEARTBEAT_INTERVAL, DEFAULT_HEARTBEAT_INTERVAL
+        )
+        if not interval:
+            return
+
+        @callback
+        def _async_start(_now: datetime) -> None:
+            self.entry.async_on_unload(
+                async_track_time_interval(
+                    self.hass, self._async_heartbeat, timedelta(seconds=interval)
+                )
+            )
+
+        # Spread the probes of a large fleet over the whole interval.
+        self.entry.async_on_unload(
+            async_call_later(self.hass, random.uniform(0, interval), _async_start)
+        )
+
+    async def _async_heartbeat(self, _now: datetime) -> None:
+        """Probe the API port; flip availability fast when it stops answering."""
+        if self._probing:
+            return
+        self._probing = True
+        try:
+            await self.entry.runtime_data.client.async_probe(HEARTBEAT_TIMEOUT)
+        except AvalonMinerApiError as exc:
+            self._probe_failures += 1
+            if self._probe_failures >= HEARTBEAT_FAILURES:
+                self._probe_marked_down = True
+                if self.last_update_success:
+                    self.async_set_update_error(exc)
+            return
+        finally:
+            self._probing = False
+
+        self._probe_failures = 0
+        if self._probe_marked_down:
+            self._probe_marked_down = False
+            await self.async_refresh_now()
+
+    @callback
+    def _async_update_issues(self) -> None:
+        """Raise or clear one repair issue per detected anomaly."""
+        for anomaly, sources in self.anomalies.problems.items():
+            issue_id = f"{anomaly}_{self.device}"
+            if sources:
+                ir.async_create_issue(
+                    self.hass,
+                    DOMAIN,
+                    issue_id,
+                    is_fixable=False,
+                    severity=ir.IssueSeverity.WARNING,
+                    translation_key=anomaly,
+                    translation_placeholders={
+                        "name": self.entry.title,
+                        "sources": ", ".join(sources),
+                    },
+                )
+            else:
+                ir.async_delete_issue(self.hass, DOMAIN, issue_id)
+
+    @callback
+    def async_fire_event(self, event_type: str, data: dict[str, Any]) -> None:
+        """Fire an avalon_miner_event of this miner."""
+        device = dr.async_get(self.hass).async_get_device(
+            identifiers={(DOMAIN, self.device)}
+        )
+        self.hass.bus.async_fire(
+            EVENT_AVALON_MINER,
+            {
+                "type": event_type,
+                "device_id": device.id if device else None,
+                "dna": self.device,
+                "name": self.entry.title,
+                **data,
+            },
+        )
+
+    @callback
+    def _async_fire_transitions(
+        self, before: dict[str, Any], after: dict[str, Any]
+    ) -> None:
+        """Fire one event per semantic transition between two samples."""
+        for event_type, old, new in diff_snapshots(before, after):
+            self.async_fire_event(event_type, {"before": old, "after": new})
+
+    async def async_refresh_now(self) -> None:
+        """Refresh and publish the result without waiting for the window."""
+        self._next_publish = 0.0
+        await self.async_refresh()
+
     async def async_set_fan_speed(self, value: int) -> None:
         """Set fan speed and refresh."""
         await self.entry.runtime_data.client.async_set_fan_speed(value)
-        await self.async_refresh()
+        await self.async_refresh_now()
 
     async def async_set_work_mode(self, mode: str) -> None:
         """Set work mode and refresh."""
         await self.entry.runtime_data.client.async_set_work_mode(mode)
-        await self.async_refresh()
+        await self.async_refresh_now()
 
     async def async_set_target_temp(self, temp: int) -> None:
         """Set target temperature and refresh."""
         await self.entry.runtime_data.client.async_set_target_temp(temp)
-        await self.async_refresh()
+        await self.async_refresh_now()
+
+    def _carry_forward(self, sample: dict[str, Any]) -> None:
+        """Fill the fields of commands that failed this poll from the last one.
+
+        Carried fields keep the time of their last fresh value; their age is
+        stored under "field_age" and entities reading a field older than the
+        stale threshold go unavailable.
+        """
+        now = time.monotonic()
+        failed = set(sample.get("failed_commands", ()))
+        for key in sample:
+            self._field_updated[key] = now
+        ages: dict[str, float] = {}
+        if failed and self.sample is not None:
+            for key, value in self.sample.items():
+                if key in sample or command_for_key(key) not in failed:
+                    continue
+                sample[key] = value
+                if (updated := self._field_updated.get(key)) is not None:
+                    ages[key] = round(now - updated, 1)
+        sample["field_age"] = ages
+
+    def fields_fresh(self, keys: frozenset[str] | None) -> bool:
+        """Return False if any of the keys is older than the stale threshold.
+
+        A threshold of 0 disables the check.
+        """
+        if not keys or not self._stale_threshold:
+            return True
+        now = time.monotonic()
+        return all(
+            now - self._field_updated.get(key, now) <= self._stale_threshold
+            for key in keys
+        )
+
+    def _update_boot_time(self, sample: dict[str, Any]) -> None:
+        """Derive the boot time from Elapsed, moving it only on a reboot.
+
+        now - Elapsed wobbles by the poll latency and clock adjustments; the
+        stored value is kept until it is off by more than the tolerance, so
+        the last boot sensor only changes when the miner actually rebooted.
+        """
+        elapsed = sample.get("elapsed")
+        if elapsed:
+            boot_time = dt_util.utcnow() - timedelta(seconds=elapsed)
+            if (
+                self._boot_time is None
+                or abs((boot_time - self._boot_time).total_seconds())
+                > BOOT_TIME_TOLERANCE
+            ):
+                self._boot_time = boot_time.replace(microsecond=0)
+        sample["boot_time"] = self._boot_time
+
+    def supports(self, data_key: str) -> bool:
+        """Return whether this model/firmware provides a snapshot key."""
+        if self.capabilities is None:
+            return True
+        if data_key in MM_FIELD_KEYS:
+            return data_key in self.capabilities.fields
+        for command, command_keys in COMMAND_KEYS.items():
+            if data_key in command_keys:
+                return command in self.capabilities.commands
+        return True
+
+    def _required_keys(self) -> set[str] | None:
+        """Return the snapshot keys needed by listening entities and features.
+
+        None (decode everything) until the entities have been added.
+        """
+        if self.data is None:
+            return None
+        keys = set(CORE_KEYS)
+        if self.hass.bus.async_listeners().get(EVENT_AVALON_MINER):
+            keys.update(POOL_EVENT_KEYS)
+        if self.statistics is not None:
+            keys.update(STATISTICS_KEYS)
+        if self.scheduler is not None:
+            keys.update(PROFILE_KEYS)
+        if self.tuning:
+            keys.update(TUNING_KEYS)
+        keys.update(async_subscribed_fields(self.hass, self.device))
+        if self.hass.data.get(DATA_METRICS_SCRAPED):
+            keys.update(METRICS_KEYS)
+        for data_keys in self.async_contexts():
+            if data_keys:
+                keys.update(data_keys)
+        return {key for key in keys if self.supports(key)}
+
+    async def async_set_curtail_state(self, state: dict[str, Any] | None) -> None:
+        """Record the pre-curtail state, or clear it after a restore."""
+        self.curtail_state = state
+        if state is None:
+            await self._curtail_store.async_remove()
+        else:
+            await self._curtail_store.async_save(state)
+
+    async def async_load(self) -> None:
+        """Load the stored state and the capabilities of this model/firmware.
+
+        Called from async_setup_entry before the first refresh.
+        """
+        self.curtail_state = await self._curtail_store.async_load()
+        if self.statistics is not None:
+            await self.statistics.async_load()
+        try:
+            self.capabilities = await async_get_capabilities(
+                self.hass,
+                self.entry.runtime_data.client,
+                self.entry.data["model"],
+                self.entry.data.get("firmware", ""),
+            )
+        except AvalonMinerApiError as exception:
+            raise ConfigEntryNotReady(exception) from exception
 
     async def _async_update_data(self) -> Any:
         """Update data via library."""
+        client = self.entry.runtime_data.client
+        keys = self._required_keys()
+        commands = self.capabilities.commands if self.capabilities else None
+        start = time.monotonic()
         try:
-            return await self.entry.runtime_data.client.async_fetch_all_data()
+            if self.parser is None:
+                sample = await client.async_fetch_all_data(keys, commands)
+            else:
+                sample = await self.parser.async_parse(
+                    await client.async_fetch_raw(keys, commands),
+                    keys,
+                    client.source,
+                )
         except AvalonMinerApiError as exception:
+            self.poll_errors += 1
             raise UpdateFailed(exception) from exception
+        self.poll_duration = time.monotonic() - start
+        self._update_boot_time(sample)
+        self._carry_forward(sample)
+
+        firmware = sample.get("firmware")
+        if firmware and firmware != self.entry.data.get("firmware"):
+            # Updating the entry reloads it, which probes the new firmware.
+            LOGGER.info(
+                "Firmware of %s changed to %s", self.entry.title, firmware
+            )
+            self.hass.config_entries.async_update_entry(
+                self.entry, data={**self.entry.data, "firmware": firmware}
+            )
+
+        if self.sample is not None:
+            self._async_fire_transitions(self.sample, sample)
+        self.sample = sample
+        if self.statistics is not None:
+            self.statistics.async_add(sample)
+        if self.scheduler is not None:
+            self.scheduler.async_add_sample(sample)
+        if self.anomalies.update(sample):
+            self._async_update_issues()
+            # Problems are published as soon as they are detected.
+            self._next_publish = 0.0
+        sample["anomalies"] = {
+            key: list(sources) for key, sources in self.anomalies.problems.items()
+        }
+        # Live subscribers get every sample, regardless of the publish window.
+        async_dispatcher_send(self.hass, SIGNAL_SAMPLE, self.device, sample)
+        if not self._publish_interval:
+            return sample
+
+        self._window.add(sample)
+        now = time.monotonic()
+        if self.data is not None and now < self._next_publish:
+            # Returning the unchanged published data skips the listeners.
+            return self.data
+        self._next_publish = now + self._publish_interval
+        return self._window.aggregate(sample)
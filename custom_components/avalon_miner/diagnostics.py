@@ -0,0 +1,106 @@
+"""Diagnostics support for avalon_miner."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import asdict
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.util import dt as dt_util
+
+from .api import AvalonMinerApiError, decode_response
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .api import CommandRecord
+    from .data import AvalonMinerConfigEntry
+
+# Pool credentials in pools/lcd replies and in the parsed snapshot.
+TO_REDACT = {"User", "Password", "Pass", "pool_user"}
+
+_CREDENTIAL = re.compile(r'("(?:User|Password|Pass)"\s*:\s*)"[^"]*"')
+
+
+def _response(record: CommandRecord, source: str) -> Any:
+    """Decode a recorded reply, redacting credentials."""
+    if not record.response:
+        return None
+    try:
+        return async_redact_data(decode_response(record.response, source), TO_REDACT)
+    except AvalonMinerApiError:
+        # Undecodable replies are kept as text, with credentials still masked.
+        text = record.response.decode("utf-8", errors="replace")
+        return _CREDENTIAL.sub(r'\1"**REDACTED**"', text)
+
+
+def _timings(history: list[CommandRecord]) -> dict[str, dict[str, Any]]:
+    """Summarize the recorded exchanges per command."""
+    timings: dict[str, dict[str, Any]] = {}
+    for record in history:
+        timing = timings.setdefault(
+            record.command,
+            {"count": 0, "errors": 0, "total_elapsed": 0.0, "max_elapsed": 0.0},
+        )
+        timing["count"] += 1
+        timing["errors"] += record.error is not None
+        timing["total_elapsed"] += record.elapsed
+        timing["max_elapsed"] = max(timing["max_elapsed"], record.elapsed)
+    for timing in timings.values():
+        timing["mean_elapsed"] = timing.pop("total_elapsed") / timing["count"]
+    return timings
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: AvalonMinerConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    client = entry.runtime_data.client
+    coordinator = entry.runtime_data.coordinator
+    history = list(client.history)
+    capabilities = coordinator.capabilities
+
+    return {
+        "entry": {
+            "title": entry.title,
+            "data": dict(entry.data),
+            "options": dict(entry.options),
+        },
+        "client": {
+            "source": client.source,
+            "stats": asdict(client.stats),
+        },
+        "coordinator": {
+            "update_interval": (
+                coordinator.update_interval.total_seconds()
+                if coordinator.update_interval
+                else None
+            ),
+            "last_update_success": coordinator.last_update_success,
+            "last_exception": (
+                repr(coordinator.last_exception)
+                if coordinator.last_exception
+                else None
+            ),
+            "poll_duration": coordinator.poll_duration,
+            "poll_errors": coordinator.poll_errors,
+            "offload_parsing": coordinator.parser is not None,
+            "long_term_statistics": coordinator.statistics is not None,
+            "capabilities": capabilities.as_dict() if capabilities else None,
+            "anomalies": coordinator.anomalies.problems,
+        },
+        "snapshot": async_redact_data(coordinator.sample or {}, TO_REDACT),
+        "commands": _timings(history),
+        "history": [
+            {
+                "time": dt_util.utc_from_timestamp(record.time).isoformat(),
+                "command": record.command,
+                "params": record.params,
+                "elapsed": record.elapsed,
+                "error": record.error,
+                "response": _response(record, client.source),
+            }
+            for record in history
+        ],
+    }
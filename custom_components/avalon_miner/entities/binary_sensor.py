@@ -10,6 +10,7 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntityDescription,
 )
 
+from ..anomaly import ANOMALIES, ANOMALY_INPUTS
 from ..const import DOMAIN
 from ..entity import AvalonMinerEntity
 
@@ -20,6 +21,13 @@ if TYPE_CHECKING:
     from ..coordinator import AvalonMinerDataUpdateCoordinator
     from ..data import AvalonMinerConfigEntry
 
+# Binary sensor key -> snapshot keys it is derived from.
+DATA_KEYS = {
+    "miner_running": frozenset({"soft_off"}),
+    "pool_connected": frozenset({"pools"}),
+    **{anomaly: frozenset(keys) for anomaly, keys in ANOMALY_INPUTS.items()},
+}
+
 ENTITY_DESCRIPTIONS = (
     BinarySensorEntityDescription(
         key="miner_running",
@@ -33,6 +41,24 @@ ENTITY_DESCRIPTIONS = (
         entity_registry_enabled_default=True,
         device_class=BinarySensorDeviceClass.CONNECTIVITY,
     ),
+    BinarySensorEntityDescription(
+        key="fan_problem",
+        icon="mdi:fan-alert",
+        entity_registry_enabled_default=True,
+        device_class=BinarySensorDeviceClass.PROBLEM,
+    ),
+    BinarySensorEntityDescription(
+        key="hashboard_problem",
+        icon="mdi:chip",
+        entity_registry_enabled_default=True,
+        device_class=BinarySensorDeviceClass.PROBLEM,
+    ),
+    BinarySensorEntityDescription(
+        key="hashrate_drift",
+        icon="mdi:trending-down",
+        entity_registry_enabled_default=True,
+        device_class=BinarySensorDeviceClass.PROBLEM,
+    ),
 )
 
 
@@ -42,12 +68,14 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the binary sensor platform."""
+    coordinator = entry.runtime_data.coordinator
     async_add_entities(
         AvalonMinerBinarySensor(
-            coordinator=entry.runtime_data.coordinator,
+            coordinator=coordinator,
             entity_description=entity_description,
         )
         for entity_description in ENTITY_DESCRIPTIONS
+        if any(coordinator.supports(key) for key in DATA_KEYS[entity_description.key])
     )
 
 
@@ -60,7 +88,7 @@ class AvalonMinerBinarySensor(AvalonMinerEntity, BinarySensorEntity):
         entity_description: BinarySensorEntityDescription,
     ) -> None:
         """Initialize the binary sensor class."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, DATA_KEYS[entity_description.key])
         self.entity_description = entity_description
         self._attr_translation_key = entity_description.key
         self._attr_unique_id = (
@@ -78,14 +106,26 @@ class AvalonMinerBinarySensor(AvalonMinerEntity, BinarySensorEntity):
             return data.get("soft_off") == "0"
 
         if self.entity_description.key == "pool_connected":
-            pools = data.get("pools", [])
-            if pools:
-                return pools[0].get("Status") == "Alive"
-            return False
+            # A backup pool taking over still keeps the miner connected.
+            return any(
+                pool.get("Status") == "Alive" for pool in data.get("pools", [])
+            )
+
+        if self.entity_description.key in ANOMALIES:
+            return bool(data.get("anomalies", {}).get(self.entity_description.key))
 
         return None
 
+    @property
+    def extra_state_attributes(self) -> dict[str, list[str]] | None:
+        """Return the readings that triggered an anomaly."""
+        data = self.coordinator.data
+        if data is None or self.entity_description.key not in ANOMALIES:
+            return None
+        anomalies = data.get("anomalies", {})
+        return {"sources": anomalies.get(self.entity_description.key, [])}
+
     @property
     def available(self) -> bool:
         """Return the availability."""
-        return self.coordinator.last_update_success
+        return super().available
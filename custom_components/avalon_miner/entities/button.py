@@ -69,7 +69,7 @@ class AvalonMinerButton(AvalonMinerEntity, ButtonEntity):
     @property
     def available(self) -> bool:
         """Return the availability."""
-        return self.coordinator.last_update_success
+        return super().available
 
     async def async_press(self) -> None:
         """Handle the button press."""
@@ -20,6 +20,12 @@ if TYPE_CHECKING:
     from ..coordinator import AvalonMinerDataUpdateCoordinator
     from ..data import AvalonMinerConfigEntry
 
+# Number key -> snapshot key of the current value.
+DATA_KEYS = {
+    "fan_speed": "fan_speed_pct",
+    "target_temperature": "temp_target",
+}
+
 ENTITY_DESCRIPTIONS = (
     NumberEntityDescription(
         key="fan_speed",
@@ -66,7 +72,7 @@ class AvalonMinerNumber(AvalonMinerEntity, NumberEntity):
         entity_description: NumberEntityDescription,
     ) -> None:
         """Initialize the number class."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, frozenset({DATA_KEYS[entity_description.key]}))
         self.entity_description = entity_description
         self._attr_translation_key = entity_description.key
         self._attr_unique_id = (
@@ -79,33 +85,13 @@ class AvalonMinerNumber(AvalonMinerEntity, NumberEntity):
         data = self.coordinator.data
         if data is None:
             return None
-
-        if self.entity_description.key == "fan_speed":
-            val = data.get("fan_speed_pct")
-            if val is not None:
-                try:
-                    pct = float(val.replace("%", ""))
-                    return pct
-                except (ValueError, AttributeError):
-                    return None
-            return None
-
-        if self.entity_description.key == "target_temperature":
-            val = data.get("temp_target")
-            if val is not None:
-                try:
-                    return float(val)
-                except (ValueError, AttributeError):
-                    return None
-            return None
-
-        return None
+        return data.get(DATA_KEYS[self.entity_description.key])
 
     @property
     def available(self) -> bool:
         """Return the availability."""
         if self.coordinator.device_is_running:
-            return self.coordinator.last_update_success
+            return super().available
         return False
 
     async def async_set_native_value(self, value: float) -> None:
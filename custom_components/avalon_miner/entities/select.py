@@ -50,7 +50,7 @@ class AvalonMinerSelect(AvalonMinerEntity, SelectEntity):
         entity_description: SelectEntityDescription,
     ) -> None:
         """Initialize the select class."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, frozenset({"work_mode"}))
         self.entity_description = entity_description
         self._attr_translation_key = entity_description.key
         self._attr_unique_id = (
@@ -71,7 +71,7 @@ class AvalonMinerSelect(AvalonMinerEntity, SelectEntity):
     def available(self) -> bool:
         """Return the availability."""
         if self.coordinator.device_is_running:
-            return self.coordinator.last_update_success
+            return super().available
         return False
 
     async def async_select_option(self, option: str) -> None:
@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -10,231 +11,247 @@ from homeassistant.components.sensor import (
     SensorEntityDescription,
     SensorStateClass,
 )
-from homeassistant.const import (
-    UnitOfPower,
-    UnitOfTemperature,
-)
+from homeassistant.const import PERCENTAGE
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 
 from ..const import DOMAIN, WORK_MODE_MAP
 from ..entity import AvalonMinerEntity
+from ..fields import MM_FIELD_KEYS, MM_FIELDS
+from ..sampling import sample_value
+from ..scheduler import MINER_MODES, PROFILE_KEYS, signal_scheduler_updated
 
 if TYPE_CHECKING:
+    from datetime import datetime
+
     from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.device_registry import DeviceInfo
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
     from ..coordinator import AvalonMinerDataUpdateCoordinator
     from ..data import AvalonMinerConfigEntry
 
-ALWAYS_AVAILABLE_SENSORS = {"current_pool", "pool_user", "work_mode_display"}
+ALWAYS_AVAILABLE_SENSORS = {
+    "current_pool",
+    "pool_user",
+    "work_mode_display",
+    "last_boot",
+}
+
+
+@dataclass(frozen=True, kw_only=True)
+class AvalonMinerSensorEntityDescription(SensorEntityDescription):
+    """Sensor description bound to a snapshot key.
+
+    Numeric sensors show the snapshot value multiplied by `scale`; without a
+    scale the raw value is shown.
+    """
+
+    data_key: str
+    scale: float | None = None
+
 
 ENTITY_DESCRIPTIONS = (
-    # --- Hashrate ---
-    SensorEntityDescription(
+    # --- Hashrate (summary) ---
+    AvalonMinerSensorEntityDescription(
         key="hashrate_5s",
+        data_key="hashrate_5s",
+        scale=1 / 1_000_000,
         icon="mdi:speedometer",
         entity_registry_enabled_default=True,
         state_class=SensorStateClass.MEASUREMENT,
         native_unit_of_measurement="TH/s",
         suggested_display_precision=2,
     ),
-    SensorEntityDescription(
+    AvalonMinerSensorEntityDescription(
         key="hashrate_1m",
+        data_key="hashrate_1m",
+        scale=1 / 1_000_000,
         icon="mdi:speedometer",
         entity_registry_enabled_default=True,
         state_class=SensorStateClass.MEASUREMENT,
         native_unit_of_measurement="TH/s",
         suggested_display_precision=2,
     ),
-    SensorEntityDescription(
+    AvalonMinerSensorEntityDescription(
         key="hashrate_5m",
+        data_key="hashrate_5m",
+        scale=1 / 1_000_000,
         icon="mdi:speedometer",
         entity_registry_enabled_default=False,
         state_class=SensorStateClass.MEASUREMENT,
         native_unit_of_measurement="TH/s",
         suggested_display_precision=2,
     ),
-    SensorEntityDescription(
+    AvalonMinerSensorEntityDescription(
         key="hashrate_15m",
+        data_key="hashrate_15m",
+        scale=1 / 1_000_000,
         icon="mdi:speedometer",
         entity_registry_enabled_default=False,
         state_class=SensorStateClass.MEASUREMENT,
         native_unit_of_measurement="TH/s",
         suggested_display_precision=2,
     ),
-    SensorEntityDescription(
-        key="hashrate_avg",
-        icon="mdi:speedometer",
-        entity_registry_enabled_default=True,
-        state_class=SensorStateClass.MEASUREMENT,
-        native_unit_of_measurement="TH/s",
-        suggested_display_precision=2,
-    ),
-    SensorEntityDescription(
-        key="hashrate_current",
-        icon="mdi:speedometer",
-        entity_registry_enabled_default=False,
-        state_class=SensorStateClass.MEASUREMENT,
-        native_unit_of_measurement="TH/s",
-        suggested_display_precision=2,
-    ),
-    # --- Temperature ---
-    SensorEntityDescription(
-        key="temp_avg",
-        icon="mdi:thermometer",
-        entity_registry_enabled_default=True,
-        device_class=SensorDeviceClass.TEMPERATURE,
-        state_class=SensorStateClass.MEASUREMENT,
-        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-        suggested_display_precision=0,
-    ),
-    SensorEntityDescription(
-        key="temp_max",
-        icon="mdi:thermometer-high",
-        entity_registry_enabled_default=True,
-        device_class=SensorDeviceClass.TEMPERATURE,
-        state_class=SensorStateClass.MEASUREMENT,
-        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-        suggested_display_precision=0,
-    ),
-    SensorEntityDescription(
-        key="temp_inlet",
-        icon="mdi:thermometer-low",
-        entity_registry_enabled_default=False,
-        device_class=SensorDeviceClass.TEMPERATURE,
-        state_class=SensorStateClass.MEASUREMENT,
-        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-        suggested_display_precision=0,
-    ),
-    SensorEntityDescription(
-        key="temp_target",
-        icon="mdi:thermometer-auto",
-        entity_registry_enabled_default=True,
-        device_class=SensorDeviceClass.TEMPERATURE,
-        state_class=SensorStateClass.MEASUREMENT,
-        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-        suggested_display_precision=0,
-    ),
-    SensorEntityDescription(
-        key="temp_hb_inlet",
-        icon="mdi:thermometer-low",
-        entity_registry_enabled_default=False,
-        device_class=SensorDeviceClass.TEMPERATURE,
-        state_class=SensorStateClass.MEASUREMENT,
-        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-        suggested_display_precision=0,
-    ),
-    SensorEntityDescription(
-        key="temp_hb_outlet",
-        icon="mdi:thermometer-high",
-        entity_registry_enabled_default=False,
-        device_class=SensorDeviceClass.TEMPERATURE,
-        state_class=SensorStateClass.MEASUREMENT,
-        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
-        suggested_display_precision=0,
-    ),
-    # --- Fan ---
-    SensorEntityDescription(
-        key="fan_speed_pct",
-        icon="mdi:fan",
-        entity_registry_enabled_default=True,
-        state_class=SensorStateClass.MEASUREMENT,
-        native_unit_of_measurement="%",
-        suggested_display_precision=0,
-    ),
-    SensorEntityDescription(
-        key="fan1_rpm",
-        icon="mdi:fan",
-        entity_registry_enabled_default=True,
-        state_class=SensorStateClass.MEASUREMENT,
-        native_unit_of_measurement="RPM",
-        suggested_display_precision=0,
-    ),
-    SensorEntityDescription(
-        key="fan2_rpm",
-        icon="mdi:fan",
-        entity_registry_enabled_default=False,
-        state_class=SensorStateClass.MEASUREMENT,
-        native_unit_of_measurement="RPM",
-        suggested_display_precision=0,
-    ),
-    SensorEntityDescription(
-        key="fan3_rpm",
-        icon="mdi:fan",
-        entity_registry_enabled_default=False,
-        state_class=SensorStateClass.MEASUREMENT,
-        native_unit_of_measurement="RPM",
-        suggested_display_precision=0,
-    ),
-    SensorEntityDescription(
-        key="fan4_rpm",
-        icon="mdi:fan",
-        entity_registry_enabled_default=False,
-        state_class=SensorStateClass.MEASUREMENT,
-        native_unit_of_measurement="RPM",
-        suggested_display_precision=0,
-    ),
-    # --- Power/Mining ---
-    SensorEntityDescription(
-        key="power_output",
-        icon="mdi:flash",
-        entity_registry_enabled_default=True,
-        device_class=SensorDeviceClass.POWER,
-        state_class=SensorStateClass.MEASUREMENT,
-        native_unit_of_measurement=UnitOfPower.WATT,
-        suggested_display_precision=0,
+    # --- Hashrate, temperature, fan and power (MM ID0 registry) ---
+    *(
+        AvalonMinerSensorEntityDescription(
+            key=mm_field.sensor,
+            data_key=mm_field.key,
+            scale=mm_field.scale,
+            icon=mm_field.icon,
+            entity_registry_enabled_default=mm_field.enabled_default,
+            device_class=mm_field.device_class,
+            state_class=SensorStateClass.MEASUREMENT,
+            native_unit_of_measurement=mm_field.unit,
+            suggested_display_precision=mm_field.precision,
+        )
+        for mm_field in MM_FIELDS
+        if mm_field.sensor is not None
     ),
-    SensorEntityDescription(
+    # --- Mining ---
+    AvalonMinerSensorEntityDescription(
         key="accepted_shares",
+        data_key="accepted_shares",
         icon="mdi:check-circle",
         entity_registry_enabled_default=True,
         state_class=SensorStateClass.TOTAL_INCREASING,
     ),
-    SensorEntityDescription(
+    AvalonMinerSensorEntityDescription(
         key="rejected_shares",
+        data_key="rejected_shares",
         icon="mdi:close-circle",
         entity_registry_enabled_default=True,
         state_class=SensorStateClass.TOTAL_INCREASING,
     ),
-    SensorEntityDescription(
+    AvalonMinerSensorEntityDescription(
         key="hardware_errors",
+        data_key="hardware_errors",
         icon="mdi:alert-circle",
         entity_registry_enabled_default=False,
         state_class=SensorStateClass.TOTAL_INCREASING,
     ),
-    SensorEntityDescription(
+    AvalonMinerSensorEntityDescription(
         key="best_share",
+        data_key="best_share",
         icon="mdi:trophy",
         entity_registry_enabled_default=False,
     ),
-    SensorEntityDescription(
+    AvalonMinerSensorEntityDescription(
         key="found_blocks",
+        data_key="found_blocks",
         icon="mdi:cube",
         entity_registry_enabled_default=True,
         state_class=SensorStateClass.TOTAL_INCREASING,
     ),
     # --- Status/Info ---
-    SensorEntityDescription(
+    AvalonMinerSensorEntityDescription(
+        key="last_boot",
+        data_key="boot_time",
+        icon="mdi:restart",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        entity_registry_enabled_default=True,
+    ),
+    # Changes on every poll; last_boot carries the same information.
+    AvalonMinerSensorEntityDescription(
         key="uptime",
+        data_key="elapsed",
         icon="mdi:clock-outline",
-        entity_registry_enabled_default=True,
+        entity_registry_enabled_default=False,
     ),
-    SensorEntityDescription(
+    AvalonMinerSensorEntityDescription(
         key="work_mode_display",
+        data_key="work_mode",
         icon="mdi:cog",
         entity_registry_enabled_default=True,
     ),
-    SensorEntityDescription(
+    AvalonMinerSensorEntityDescription(
         key="current_pool",
+        data_key="current_pool",
         icon="mdi:server-network",
         entity_registry_enabled_default=True,
     ),
-    SensorEntityDescription(
+    AvalonMinerSensorEntityDescription(
         key="pool_user",
+        data_key="pool_user",
         icon="mdi:account",
         entity_registry_enabled_default=True,
     ),
 )
 
+# Per-module sensors for chained modules (MM ID1..n).
+MODULE_DESCRIPTIONS = tuple(
+    description
+    for description in ENTITY_DESCRIPTIONS
+    if description.data_key in MM_FIELD_KEYS
+)
+
+# Per-pool sensors, one set for every pool in the POOLS reply.
+POOL_DESCRIPTIONS = (
+    AvalonMinerSensorEntityDescription(
+        key="pool_status",
+        data_key="status",
+        icon="mdi:server-network",
+        entity_registry_enabled_default=True,
+    ),
+    AvalonMinerSensorEntityDescription(
+        key="pool_accepted",
+        data_key="accepted",
+        icon="mdi:check-circle",
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    AvalonMinerSensorEntityDescription(
+        key="pool_rejected",
+        data_key="rejected",
+        icon="mdi:close-circle",
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    AvalonMinerSensorEntityDescription(
+        key="pool_stale",
+        data_key="stale",
+        icon="mdi:clock-alert",
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+    ),
+    AvalonMinerSensorEntityDescription(
+        key="pool_reject_rate",
+        data_key="reject_rate",
+        scale=1,
+        icon="mdi:percent",
+        entity_registry_enabled_default=True,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=PERCENTAGE,
+        suggested_display_precision=2,
+    ),
+    AvalonMinerSensorEntityDescription(
+        key="pool_stale_rate",
+        data_key="stale_rate",
+        scale=1,
+        icon="mdi:percent",
+        entity_registry_enabled_default=True,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=PERCENTAGE,
+        suggested_display_precision=2,
+    ),
+    AvalonMinerSensorEntityDescription(
+        key="pool_difficulty",
+        data_key="difficulty",
+        scale=1,
+        icon="mdi:chart-bell-curve",
+        entity_registry_enabled_default=False,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    # Changes with every share; the frontend shows it as time since.
+    AvalonMinerSensorEntityDescription(
+        key="pool_last_share",
+        data_key="last_share",
+        icon="mdi:clock-check",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        entity_registry_enabled_default=False,
+    ),
+)
+
 
 def _format_uptime(seconds: int) -> str:
     """Format uptime in human-readable format."""
@@ -248,15 +265,24 @@ def _format_uptime(seconds: int) -> str:
     return f"{minutes}m"
 
 
-def _safe_float(value: str | None) -> float | None:
-    """Safely convert a string to float."""
-    if value is None:
-        return None
-    try:
-        val = float(value.replace("%", ""))
-        return val if val != -273 else None
-    except (ValueError, AttributeError):
-        return None
+SCHEDULER_DESCRIPTIONS = (
+    AvalonMinerSensorEntityDescription(
+        key="scheduler_recommendation",
+        data_key="work_mode",
+        icon="mdi:calendar-clock",
+        entity_registry_enabled_default=True,
+        device_class=SensorDeviceClass.ENUM,
+        options=[mode.lower() for mode in MINER_MODES],
+    ),
+    AvalonMinerSensorEntityDescription(
+        key="projected_savings",
+        data_key="power_output",
+        icon="mdi:piggy-bank",
+        entity_registry_enabled_default=True,
+        device_class=SensorDeviceClass.MONETARY,
+        state_class=SensorStateClass.TOTAL,
+    ),
+)
 
 
 async def async_setup_entry(
@@ -265,107 +291,252 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the sensor platform."""
+    coordinator = entry.runtime_data.coordinator
     async_add_entities(
         AvalonMinerSensor(
-            coordinator=entry.runtime_data.coordinator,
+            coordinator=coordinator,
             entity_description=entity_description,
         )
         for entity_description in ENTITY_DESCRIPTIONS
+        if coordinator.supports(entity_description.data_key)
+    )
+    modules = (coordinator.data or {}).get("modules", {})
+    async_add_entities(
+        AvalonMinerModuleSensor(
+            coordinator=coordinator,
+            entity_description=entity_description,
+            module=module,
+        )
+        for module in modules
+        for entity_description in MODULE_DESCRIPTIONS
+        if coordinator.supports(entity_description.data_key)
     )
+    if coordinator.supports("pool_stats"):
+        pools = (coordinator.data or {}).get("pool_stats", {})
+        async_add_entities(
+            AvalonMinerPoolSensor(
+                coordinator=coordinator,
+                entity_description=entity_description,
+                pool=pool,
+            )
+            for pool in pools
+            for entity_description in POOL_DESCRIPTIONS
+        )
+    if coordinator.scheduler is not None:
+        async_add_entities(
+            AvalonMinerSchedulerSensor(
+                coordinator=coordinator,
+                entity_description=entity_description,
+            )
+            for entity_description in SCHEDULER_DESCRIPTIONS
+        )
 
 
 class AvalonMinerSensor(AvalonMinerEntity, SensorEntity):
     """AvalonMinerSensor class."""
 
+    _always_available = False
+
     def __init__(
         self,
         coordinator: AvalonMinerDataUpdateCoordinator,
-        entity_description: SensorEntityDescription,
+        entity_description: AvalonMinerSensorEntityDescription,
+        data_keys: frozenset[str] | None = None,
     ) -> None:
         """Initialize the sensor class."""
-        super().__init__(coordinator)
+        super().__init__(
+            coordinator, data_keys or frozenset({entity_description.data_key})
+        )
         self.entity_description = entity_description
         self._attr_translation_key = entity_description.key
         self._attr_unique_id = (
             f"{self.coordinator.device}_{entity_description.key}"
         )
 
+    def _snapshot(self) -> dict[str, Any] | None:
+        """Return the snapshot this sensor reads from."""
+        return self.coordinator.data
+
     @property
-    def native_value(self) -> str | float | None:
+    def native_value(self) -> str | float | datetime | None:
         """Return the native value of the sensor."""
-        key = self.entity_description.key
-        data = self.coordinator.data
+        description = self.entity_description
+        data = self._snapshot()
 
         if data is None:
             return None
 
-        # Hashrate from summary (MHS → TH/s)
-        if key in ("hashrate_5s", "hashrate_1m", "hashrate_5m", "hashrate_15m"):
-            mhs = data.get(key, 0)
-            if mhs:
-                return float(mhs) / 1_000_000
-            return None
+        value = data.get(description.data_key)
 
-        # Hashrate from estats (GHS → TH/s)
-        if key == "hashrate_avg":
-            ghs = data.get("ghs_avg")
-            return float(ghs) / 1000 if ghs else None
+        if description.key == "uptime":
+            return _format_uptime(value) if value else None
 
-        if key == "hashrate_current":
-            ghs = data.get("ghs_spd")
-            return float(ghs) / 1000 if ghs else None
+        if description.key == "work_mode_display":
+            return WORK_MODE_MAP.get(value, f"Unknown ({value})") if value else None
 
-        # Temperature sensors
-        if key in (
-            "temp_avg", "temp_max", "temp_inlet", "temp_target",
-            "temp_hb_inlet", "temp_hb_outlet",
-        ):
-            return _safe_float(data.get(key))
+        if description.key in ("current_pool", "pool_user"):
+            return value or None
 
-        # Fan sensors
-        if key == "fan_speed_pct":
-            val = data.get("fan_speed_pct")
-            return _safe_float(val)
+        if description.scale is None:
+            return value
 
-        if key in ("fan1_rpm", "fan2_rpm", "fan3_rpm", "fan4_rpm"):
-            return _safe_float(data.get(key))
+        number = sample_value(value)
+        return number * description.scale if number is not None else None
 
-        # Power
-        if key == "power_output":
-            return _safe_float(data.get("power_output"))
+    @property
+    def extra_state_attributes(self) -> dict[str, float] | None:
+        """Return min/max over the publish window, if windowing is enabled."""
+        data = self.coordinator.data
+        description = self.entity_description
+        if not data or description.scale is None:
+            return None
+        stats = data.get("window", {}).get(description.data_key)
+        if stats is None:
+            return None
+        return {
+            "min": stats["min"] * description.scale,
+            "max": stats["max"] * description.scale,
+            "samples": stats["samples"],
+        }
 
-        # Mining stats (directly from summary)
-        if key in (
-            "accepted_shares", "rejected_shares", "hardware_errors",
-            "best_share", "found_blocks",
+    @property
+    def available(self) -> bool:
+        """Return the availability."""
+        if (
+            self._always_available
+            or self.entity_description.key in ALWAYS_AVAILABLE_SENSORS
+            or self.coordinator.device_is_running
         ):
-            return data.get(key)
+            return super().available
+        return False
 
-        # Uptime
-        if key == "uptime":
-            elapsed = data.get("elapsed", 0)
-            return _format_uptime(elapsed) if elapsed else None
 
-        # Work mode display
-        if key == "work_mode_display":
-            mode = data.get("work_mode")
-            return WORK_MODE_MAP.get(mode, f"Unknown ({mode})") if mode else None
+class AvalonMinerModuleSensor(AvalonMinerSensor):
+    """Sensor of a chained module, registered as a sub-device."""
 
-        # Pool info
-        if key == "current_pool":
-            return data.get("current_pool") or None
+    def __init__(
+        self,
+        coordinator: AvalonMinerDataUpdateCoordinator,
+        entity_description: AvalonMinerSensorEntityDescription,
+        module: str,
+    ) -> None:
+        """Initialize the module sensor class."""
+        super().__init__(coordinator, entity_description)
+        self._module = module
+        self._attr_unique_id = (
+            f"{self.coordinator.device}_mm{module}_{entity_description.key}"
+        )
 
-        if key == "pool_user":
-            return data.get("pool_user") or None
+    def _snapshot(self) -> dict[str, Any] | None:
+        """Return the parsed fields of this module."""
+        data = self.coordinator.data
+        if data is None:
+            return None
+        return data.get("modules", {}).get(self._module)
 
+    @property
+    def device_info(self) -> DeviceInfo:
+        return self.coordinator.module_device_info(self._module)
+
+    @property
+    def extra_state_attributes(self) -> None:
+        """Module values are not windowed."""
         return None
 
     @property
     def available(self) -> bool:
         """Return the availability."""
-        if (
-            self.entity_description.key in ALWAYS_AVAILABLE_SENSORS
-            or self.coordinator.device_is_running
-        ):
-            return self.coordinator.last_update_success
-        return False
+        return super().available and self._snapshot() is not None
+
+
+class AvalonMinerPoolSensor(AvalonMinerSensor):
+    """Sensor of one configured pool."""
+
+    # Pool stats are reported while the miner is soft-off.
+    _always_available = True
+
+    def __init__(
+        self,
+        coordinator: AvalonMinerDataUpdateCoordinator,
+        entity_description: AvalonMinerSensorEntityDescription,
+        pool: str,
+    ) -> None:
+        """Initialize the pool sensor class."""
+        super().__init__(coordinator, entity_description, frozenset({"pool_stats"}))
+        self._pool = pool
+        self._attr_translation_placeholders = {"pool": pool}
+        self._attr_unique_id = (
+            f"{self.coordinator.device}_pool{pool}_{entity_description.key}"
+        )
+
+    def _snapshot(self) -> dict[str, Any] | None:
+        """Return the parsed stats of this pool."""
+        data = self.coordinator.data
+        if data is None:
+            return None
+        return data.get("pool_stats", {}).get(self._pool)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the pool URL and priority on the status sensor."""
+        stats = self._snapshot()
+        if stats is None or self.entity_description.key != "pool_status":
+            return None
+        return {"url": stats["url"], "priority": stats["priority"]}
+
+
+class AvalonMinerSchedulerSensor(AvalonMinerSensor):
+    """Recommendation and projected savings of the work-mode scheduler."""
+
+    # The scheduler keeps reporting while the miner is soft-off.
+    _always_available = True
+
+    def __init__(
+        self,
+        coordinator: AvalonMinerDataUpdateCoordinator,
+        entity_description: AvalonMinerSensorEntityDescription,
+    ) -> None:
+        """Initialize the scheduler sensor class."""
+        super().__init__(coordinator, entity_description, PROFILE_KEYS)
+        if entity_description.key == "projected_savings":
+            self._attr_native_unit_of_measurement = coordinator.hass.config.currency
+
+    async def async_added_to_hass(self) -> None:
+        """Update on every scheduler evaluation."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                signal_scheduler_updated(self.coordinator.entry.entry_id),
+                self.async_write_ha_state,
+            )
+        )
+
+    @property
+    def native_value(self) -> str | float | None:
+        """Return the recommended mode or the savings so far."""
+        scheduler = self.coordinator.scheduler
+        if self.entity_description.key == "projected_savings":
+            return round(scheduler.projected_savings, 4)
+        recommendation = scheduler.recommendation
+        return recommendation.lower() if recommendation else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the inputs of the latest evaluation."""
+        scheduler = self.coordinator.scheduler
+        if self.entity_description.key == "projected_savings":
+            return {
+                "baseline": scheduler.baseline,
+                "savings_per_hour": round(scheduler.savings_per_hour, 4),
+            }
+        return {
+            "scheduler_mode": scheduler.mode,
+            "price": scheduler.price,
+            "margins": {
+                mode: round(margin, 4) for mode, margin in scheduler.margins.items()
+            },
+            "baseline": scheduler.baseline,
+            "held_until": scheduler.held_until,
+            "paused": scheduler.paused,
+        }
@@ -12,11 +12,26 @@ class AvalonMinerEntity(CoordinatorEntity[AvalonMinerDataUpdateCoordinator]):
 
     _attr_has_entity_name = True
 
-    def __init__(self, coordinator: AvalonMinerDataUpdateCoordinator) -> None:
-        """Initialize."""
-        super().__init__(coordinator)
+    def __init__(
+        self,
+        coordinator: AvalonMinerDataUpdateCoordinator,
+        data_keys: frozenset[str] | None = None,
+    ) -> None:
+        """Initialize.
+
+        `data_keys` are the snapshot keys the entity reads; the coordinator
+        only decodes fields some listening entity needs.
+        """
+        super().__init__(coordinator, data_keys)
         self._attr_unique_id = coordinator.entry.entry_id
 
+    @property
+    def available(self) -> bool:
+        """Unavailable once a field the entity reads has gone stale."""
+        return super().available and self.coordinator.fields_fresh(
+            self.coordinator_context
+        )
+
     @property
     def device_info(self) -> dict:
         return self.coordinator.device_info
@@ -0,0 +1,87 @@
+"""Snapshot diffing into transition events for avalon_miner."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from .const import WORK_MODE_MAP
+
+EVENT_SOFT_OFF = "soft_off"
+EVENT_SOFT_ON = "soft_on"
+EVENT_WORK_MODE_CHANGED = "work_mode_changed"
+EVENT_POOL_FAILOVER = "pool_failover"
+EVENT_POOL_STATUS_CHANGED = "pool_status_changed"
+EVENT_REBOOT = "reboot"
+
+# Snapshot keys only the pool events read. They cost the `pools` and `lcd`
+# commands, so they are polled only while something listens to the events.
+POOL_EVENT_KEYS = frozenset({"current_pool", "pools"})
+
+
+def _pool_status(snapshot: dict[str, Any]) -> dict[str, str]:
+    """Return pool URL -> Status."""
+    return {
+        pool.get("URL", str(pool.get("POOL"))): pool.get("Status", "")
+        for pool in snapshot.get("pools") or []
+    }
+
+
+def diff_snapshots(
+    before: dict[str, Any], after: dict[str, Any]
+) -> list[tuple[str, dict[str, Any], dict[str, Any]]]:
+    """Return (event type, before, after) for every transition between samples.
+
+    Fields missing from either snapshot (failed or skipped commands) never
+    produce a transition.
+    """
+    transitions: list[tuple[str, dict[str, Any], dict[str, Any]]] = []
+
+    old_off, new_off = before.get("soft_off"), after.get("soft_off")
+    if old_off is not None and new_off is not None and old_off != new_off:
+        transitions.append(
+            (
+                EVENT_SOFT_ON if new_off == "0" else EVENT_SOFT_OFF,
+                {"soft_off": old_off},
+                {"soft_off": new_off},
+            )
+        )
+
+    old_mode, new_mode = before.get("work_mode"), after.get("work_mode")
+    if old_mode is not None and new_mode is not None and old_mode != new_mode:
+        transitions.append(
+            (
+                EVENT_WORK_MODE_CHANGED,
+                {"work_mode": WORK_MODE_MAP.get(old_mode, old_mode)},
+                {"work_mode": WORK_MODE_MAP.get(new_mode, new_mode)},
+            )
+        )
+
+    old_pool, new_pool = before.get("current_pool"), after.get("current_pool")
+    if old_pool and new_pool and old_pool != new_pool:
+        transitions.append(
+            (
+                EVENT_POOL_FAILOVER,
+                {"current_pool": old_pool},
+                {"current_pool": new_pool},
+            )
+        )
+
+    old_status, new_status = _pool_status(before), _pool_status(after)
+    for url, status in new_status.items():
+        previous = old_status.get(url)
+        if previous is not None and previous != status:
+            transitions.append(
+                (
+                    EVENT_POOL_STATUS_CHANGED,
+                    {"pool": url, "status": previous},
+                    {"pool": url, "status": status},
+                )
+            )
+
+    old_elapsed, new_elapsed = before.get("elapsed"), after.get("elapsed")
+    if old_elapsed and new_elapsed is not None and new_elapsed < old_elapsed:
+        transitions.append(
+            (EVENT_REBOOT, {"elapsed": old_elapsed}, {"elapsed": new_elapsed})
+        )
+
+    return transitions
@@ -0,0 +1,152 @@
+"""Declarative registry of the MM ID0 fields in ESTATS responses."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.sensor import SensorDeviceClass
+from homeassistant.const import PERCENTAGE, UnitOfPower, UnitOfTemperature
+
+from .sampling import sample_value
+
+if TYPE_CHECKING:
+    from collections.abc import Collection
+
+
+@dataclass(frozen=True, kw_only=True)
+class MmField:
+    """One `Tag[value]` entry of the MM ID0 string.
+
+    Fields with a `sensor` key also generate a sensor description; the
+    sensor shows the parsed value multiplied by `scale` in `unit`.
+    """
+
+    key: str
+    tag: str
+    numeric: bool = True
+    sensor: str | None = None
+    scale: float = 1.0
+    unit: str | None = None
+    device_class: SensorDeviceClass | None = None
+    icon: str | None = None
+    enabled_default: bool = True
+    precision: int | None = None
+    pattern: re.Pattern[str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Compile the tag pattern once."""
+        # The lookbehind keeps e.g. "ITemp" from matching inside "HBITemp".
+        object.__setattr__(
+            self, "pattern", re.compile(rf"(?<!\w){re.escape(self.tag)}\[([^\]]*)\]")
+        )
+
+    def parse(self, mm_id: str) -> Any:
+        """Return the typed value of this field, None if absent or a sentinel."""
+        match = self.pattern.search(mm_id)
+        if match is None:
+            return None
+        return sample_value(match.group(1)) if self.numeric else match.group(1)
+
+
+def _temperature(key: str, tag: str, icon: str, enabled: bool) -> MmField:
+    return MmField(
+        key=key,
+        tag=tag,
+        sensor=key,
+        unit=UnitOfTemperature.CELSIUS,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        icon=icon,
+        enabled_default=enabled,
+        precision=0,
+    )
+
+
+def _fan(index: int, enabled: bool) -> MmField:
+    key = f"fan{index}_rpm"
+    return MmField(
+        key=key,
+        tag=f"Fan{index}",
+        sensor=key,
+        unit="RPM",
+        icon="mdi:fan",
+        enabled_default=enabled,
+        precision=0,
+    )
+
+
+MM_FIELDS: tuple[MmField, ...] = (
+    MmField(key="soft_off", tag="SoftOFF", numeric=False),
+    MmField(key="work_mode", tag="WORKMODE", numeric=False),
+    MmField(
+        key="ghs_avg",
+        tag="GHSavg",
+        sensor="hashrate_avg",
+        scale=1 / 1000,
+        unit="TH/s",
+        icon="mdi:speedometer",
+        precision=2,
+    ),
+    MmField(
+        key="ghs_spd",
+        tag="GHSspd",
+        sensor="hashrate_current",
+        scale=1 / 1000,
+        unit="TH/s",
+        icon="mdi:speedometer",
+        enabled_default=False,
+        precision=2,
+    ),
+    _temperature("temp_avg", "TAvg", "mdi:thermometer", True),
+    _temperature("temp_max", "TMax", "mdi:thermometer-high", True),
+    _temperature("temp_inlet", "ITemp", "mdi:thermometer-low", False),
+    _temperature("temp_target", "TarT", "mdi:thermometer-auto", True),
+    _temperature("temp_hb_inlet", "HBITemp", "mdi:thermometer-low", False),
+    _temperature("temp_hb_outlet", "HBOTemp", "mdi:thermometer-high", False),
+    MmField(
+        key="fan_speed_pct",
+        tag="FanR",
+        sensor="fan_speed_pct",
+        unit=PERCENTAGE,
+        icon="mdi:fan",
+        precision=0,
+    ),
+    _fan(1, True),
+    _fan(2, False),
+    _fan(3, False),
+    _fan(4, False),
+    MmField(
+        key="power_output",
+        tag="MPO",
+        sensor="power_output",
+        unit=UnitOfPower.WATT,
+        device_class=SensorDeviceClass.POWER,
+        icon="mdi:flash",
+        precision=0,
+    ),
+)
+
+MM_FIELD_KEYS = frozenset(mm_field.key for mm_field in MM_FIELDS)
+
+# Fan1..FanN; FanR (the fan duty in percent) does not match.
+FAN_TAG = re.compile(r"(?<!\w)Fan(\d+)\[")
+
+
+def count_fans(mm_id: str) -> int:
+    """Return the number of Fan1..FanN tags an MM ID string reports."""
+    return len(set(FAN_TAG.findall(mm_id)))
+
+
+def parse_mm_fields(
+    mm_id: str, keys: Collection[str] | None = None
+) -> dict[str, Any]:
+    """Decode the registry fields of an MM ID string.
+
+    Only fields whose key is in `keys` are decoded; None decodes all of them.
+    """
+    return {
+        mm_field.key: mm_field.parse(mm_id)
+        for mm_field in MM_FIELDS
+        if keys is None or mm_field.key in keys
+    }
@@ -0,0 +1,386 @@
+"""Fleet-wide orchestration for avalon_miner."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import (
+    ATTR_AREA_ID,
+    ATTR_DEVICE_ID,
+    ATTR_ENTITY_ID,
+    ATTR_FLOOR_ID,
+    ATTR_LABEL_ID,
+    CONF_HOST,
+)
+from homeassistant.core import callback
+from homeassistant.helpers.service import async_extract_config_entry_ids
+
+from .api import AvalonMinerApiError
+from .const import (
+    CURTAIL_MODE_OFF,
+    DOMAIN,
+    LOGGER,
+    WORK_MODE_MAP,
+    WORK_MODE_REVERSE_MAP,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from homeassistant.core import HomeAssistant, ServiceCall
+
+    from .api import AvalonMinerApiClient
+    from .coordinator import AvalonMinerDataUpdateCoordinator
+
+TARGET_FIELDS = (
+    ATTR_ENTITY_ID,
+    ATTR_DEVICE_ID,
+    ATTR_AREA_ID,
+    ATTR_FLOOR_ID,
+    ATTR_LABEL_ID,
+)
+
+# Seconds between estats reads while waiting for a miner to confirm a change.
+CONFIRM_INTERVAL = 2
+
+
+@callback
+def async_get_loaded_coordinators(
+    hass: HomeAssistant,
+) -> list[AvalonMinerDataUpdateCoordinator]:
+    """Return the coordinators of all loaded miners."""
+    return [
+        entry.runtime_data.coordinator
+        for entry in hass.config_entries.async_entries(DOMAIN)
+        if entry.state is ConfigEntryState.LOADED
+    ]
+
+
+async def async_get_target_coordinators(
+    hass: HomeAssistant, call: ServiceCall
+) -> list[AvalonMinerDataUpdateCoordinator]:
+    """Return the coordinators of the loaded miners targeted by a service call.
+
+    A call without any target addresses the whole fleet.
+    """
+    coordinators = async_get_loaded_coordinators(hass)
+    if any(call.data.get(field) for field in TARGET_FIELDS):
+        entry_ids = await async_extract_config_entry_ids(hass, call)
+        coordinators = [
+            coordinator
+            for coordinator in coordinators
+            if coordinator.entry.entry_id in entry_ids
+        ]
+    return coordinators
+
+
+async def async_run_fleet(
+    coordinators: list[AvalonMinerDataUpdateCoordinator],
+    action: Callable[[AvalonMinerDataUpdateCoordinator], Awaitable[dict[str, Any]]],
+    max_parallel: int,
+    deadline: float | None = None,
+) -> dict[str, dict[str, Any]]:
+    """Run an action on every miner with bounded concurrency.
+
+    All miners share one deadline (in seconds, counted from the start of the
+    run, queueing included). Returns a per-miner report keyed by DNA.
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(max_parallel)
+    started = loop.time()
+    deadline_at = started + deadline if deadline is not None else None
+
+    async def _async_run(
+        coordinator: AvalonMinerDataUpdateCoordinator,
+    ) -> tuple[str, dict[str, Any]]:
+        report: dict[str, Any] = {
+            "name": coordinator.entry.title,
+            "host": coordinator.entry.data[CONF_HOST],
+        }
+        try:
+            async with asyncio.timeout_at(deadline_at), semaphore:
+                report.update(await action(coordinator))
+        except TimeoutError:
+            report["status"] = "timeout"
+        except AvalonMinerApiError as exc:
+            report["status"] = "error"
+            report["error"] = str(exc)
+        report["elapsed"] = round(loop.time() - started, 2)
+        return coordinator.device, report
+
+    results = await asyncio.gather(*(_async_run(c) for c in coordinators))
+    return dict(results)
+
+
+def describe_state(state: dict[str, Any] | None) -> str | None:
+    """Return "off" or the work mode name for an estats snapshot."""
+    if not state or state.get("soft_off") is None:
+        return None
+    if state["soft_off"] != "0":
+        return CURTAIL_MODE_OFF
+    mode = state.get("work_mode")
+    return WORK_MODE_MAP.get(mode, mode)
+
+
+async def async_wait_for_state(
+    client: AvalonMinerApiClient,
+    predicate: Callable[[dict[str, Any]], bool],
+) -> dict[str, Any]:
+    """Read estats until the predicate holds.
+
+    Runs until cancelled; callers bound it with their deadline.
+    """
+    while True:
+        try:
+            state = await client.async_get_estats_data()
+        except AvalonMinerApiError as exc:
+            LOGGER.debug("Waiting for miner state: %s", exc)
+        else:
+            if predicate(state):
+                return state
+        await asyncio.sleep(CONFIRM_INTERVAL)
+
+
+async def async_curtail(
+    coordinator: AvalonMinerDataUpdateCoordinator, mode: str
+) -> dict[str, Any]:
+    """Switch a miner to soft-off or a lower work mode and confirm it."""
+    client = coordinator.entry.runtime_data.client
+    if coordinator.curtail_state is None:
+        current = await client.async_get_estats_data()
+        await coordinator.async_set_curtail_state(
+            {
+                "soft_off": current.get("soft_off"),
+                "work_mode": current.get("work_mode"),
+            }
+        )
+
+    if mode == CURTAIL_MODE_OFF:
+        await client.async_soft_off()
+        state = await async_wait_for_state(
+            client, lambda s: s.get("soft_off") not in (None, "0")
+        )
+    else:
+        mode_value = WORK_MODE_REVERSE_MAP[mode]
+        await client.async_set_work_mode(mode_value)
+        state = await async_wait_for_state(
+            client, lambda s: s.get("work_mode") == mode_value
+        )
+
+    return {
+        "status": "confirmed",
+        "previous": describe_state(coordinator.curtail_state),
+        "current": describe_state(state),
+    }
+
+
+async def async_apply_mode(
+    coordinator: AvalonMinerDataUpdateCoordinator, mode: str
+) -> dict[str, Any]:
+    """Put a miner into soft-off, or hashing in the given work mode, and confirm.
+
+    Unlike a curtail, this soft-ons the miner when needed and records no
+    state to restore.
+    """
+    client = coordinator.entry.runtime_data.client
+    state = await client.async_get_estats_data()
+    if mode == CURTAIL_MODE_OFF:
+        if state.get("soft_off") == "0":
+            await client.async_soft_off()
+            state = await async_wait_for_state(
+                client, lambda s: s.get("soft_off") not in (None, "0")
+            )
+    else:
+        if state.get("soft_off") != "0":
+            await client.async_soft_on()
+            state = await async_wait_for_state(
+                client, lambda s: s.get("soft_off") == "0"
+            )
+        mode_value = WORK_MODE_REVERSE_MAP[mode]
+        if state.get("work_mode") != mode_value:
+            await client.async_set_work_mode(mode_value)
+            state = await async_wait_for_state(
+                client, lambda s: s.get("work_mode") == mode_value
+            )
+    return {"status": "confirmed", "current": describe_state(state)}
+
+
+async def async_restore(
+    coordinator: AvalonMinerDataUpdateCoordinator,
+) -> dict[str, Any]:
+    """Put a curtailed miner back into the state it had before the curtail."""
+    previous = coordinator.curtail_state
+    if previous is None:
+        return {"status": "skipped", "current": describe_state(coordinator.data)}
+
+    client = coordinator.entry.runtime_data.client
+    state = await client.async_get_estats_data()
+
+    if previous.get("soft_off") == "0":
+        if state.get("soft_off") != "0":
+            await client.async_soft_on()
+            state = await async_wait_for_state(
+                client, lambda s: s.get("soft_off") == "0"
+            )
+        mode_value = previous.get("work_mode")
+        if mode_value is not None and state.get("work_mode") != mode_value:
+            await client.async_set_work_mode(mode_value)
+            state = await async_wait_for_state(
+                client, lambda s: s.get("work_mode") == mode_value
+            )
+
+    await coordinator.async_set_curtail_state(None)
+    return {"status": "confirmed", "current": describe_state(state)}
+
+
+def _hashrate(state: dict[str, Any]) -> float:
+    """Return the current GHSspd of an estats snapshot, 0 if unknown."""
+    return state.get("ghs_spd") or 0.0
+
+
+async def async_reboot_and_wait(
+    coordinator: AvalonMinerDataUpdateCoordinator,
+    recovery_timeout: float,
+    min_hashrate: float,
+) -> dict[str, Any]:
+    """Reboot a miner and wait until it is healthy again.
+
+    Healthy means the miner answers estats after an `Elapsed` reset, is not
+    soft-off and hashes at least `min_hashrate` percent of its healthy rate:
+    the highest of its pre-reboot GHSspd, its GHSavg since the last boot and
+    the anomaly detector's baseline. A miner hashing nothing never counts as
+    recovered, even if it was already down before the reboot.
+    """
+    client = coordinator.entry.runtime_data.client
+    before = await client.async_get_estats_data()
+    elapsed_before = before.get("elapsed") or 0
+    reference = max(
+        _hashrate(before),
+        before.get("ghs_avg") or 0.0,
+        coordinator.anomalies.baseline_hashrate or 0.0,
+    )
+    required = reference * min_hashrate / 100
+
+    rebooted = False
+
+    def _healthy(state: dict[str, Any]) -> bool:
+        nonlocal rebooted
+        # Once the reset was seen, Elapsed may grow past its old value while
+        # the hashrate is still ramping up.
+        rebooted = rebooted or (state.get("elapsed") or 0) < elapsed_before
+        return (
+            rebooted
+            and state.get("soft_off") == "0"
+            and _hashrate(state) > 0
+            and _hashrate(state) >= required
+        )
+
+    await client.async_reboot()
+    try:
+        async with asyncio.timeout(recovery_timeout):
+            state = await async_wait_for_state(client, _healthy)
+    except TimeoutError:
+        return {"status": "not_recovered"}
+    return {"status": "recovered", "hashrate_ghs": _hashrate(state)}
+
+
+async def async_rolling_reboot(
+    coordinators: list[AvalonMinerDataUpdateCoordinator],
+    batch_size: int,
+    batch_delay: float,
+    recovery_timeout: float,
+    min_hashrate: float,
+    max_failures: int,
+) -> dict[str, Any]:
+    """Reboot miners in batches, waiting for each batch to recover.
+
+    Stops once more than `max_failures` miners failed to recover; the
+    remaining miners are reported as skipped.
+    """
+    results: dict[str, dict[str, Any]] = {}
+    failures = 0
+    aborted = False
+
+    for start in range(0, len(coordinators), batch_size):
+        batch = coordinators[start : start + batch_size]
+        if aborted:
+            for coordinator in batch:
+                results[coordinator.device] = {
+                    "name": coordinator.entry.title,
+                    "host": coordinator.entry.data[CONF_HOST],
+                    "status": "skipped",
+                }
+            continue
+
+        if start:
+            await asyncio.sleep(batch_delay)
+
+        batch_results = await async_run_fleet(
+            batch,
+            lambda coordinator: async_reboot_and_wait(
+                coordinator, recovery_timeout, min_hashrate
+            ),
+            batch_size,
+        )
+        results.update(batch_results)
+        failures += sum(
+            1 for report in batch_results.values() if report["status"] != "recovered"
+        )
+        if failures > max_failures:
+            LOGGER.warning(
+                "Rolling reboot aborted: %s miners failed to recover", failures
+            )
+            aborted = True
+
+    return {"aborted": aborted, "failures": failures, "miners": results}
+
+
+def _verify_settings(
+    settings: dict[str, Any], state: dict[str, Any]
+) -> dict[str, Any]:
+    """Return the requested settings the miner does not report yet."""
+    mismatched: dict[str, Any] = {}
+    work_mode = settings.get("work_mode")
+    if (
+        work_mode is not None
+        and state.get("work_mode") != WORK_MODE_REVERSE_MAP[work_mode]
+    ):
+        mismatched["work_mode"] = WORK_MODE_MAP.get(state.get("work_mode"))
+    target_temp = settings.get("target_temp")
+    if target_temp is not None and _as_int(state.get("temp_target")) != target_temp:
+        mismatched["target_temp"] = state.get("temp_target")
+    fan_speed = settings.get("fan_speed")
+    # Auto fan (0) has no fixed percentage to compare against.
+    if fan_speed and _as_int(state.get("fan_speed_pct")) != fan_speed:
+        mismatched["fan_speed"] = state.get("fan_speed_pct")
+    return mismatched
+
+
+def _as_int(value: float | None) -> int | None:
+    return int(value) if value is not None else None
+
+
+async def async_apply_settings(
+    coordinator: AvalonMinerDataUpdateCoordinator, settings: dict[str, Any]
+) -> dict[str, Any]:
+    """Send settings to one miner in order and verify them with one read.
+
+    The entities are updated by a normal refresh afterwards, so the values
+    go through the same windowing and field tracking as every poll.
+    """
+    client = coordinator.entry.runtime_data.client
+    if (work_mode := settings.get("work_mode")) is not None:
+        await client.async_set_work_mode(WORK_MODE_REVERSE_MAP[work_mode])
+    if (target_temp := settings.get("target_temp")) is not None:
+        await client.async_set_target_temp(target_temp)
+    if (fan_speed := settings.get("fan_speed")) is not None:
+        await client.async_set_fan_speed(fan_speed)
+
+    state = await client.async_get_estats_data()
+    await coordinator.async_refresh_now()
+
+    if mismatched := _verify_settings(settings, state):
+        return {"status": "unconfirmed", "reported": mismatched}
+    return {"status": "confirmed"}
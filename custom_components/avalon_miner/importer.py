@@ -0,0 +1,240 @@
+"""Bulk import of a miner inventory file for avalon_miner."""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+from homeassistant.config_entries import SOURCE_IMPORT
+from homeassistant.const import CONF_HOST
+from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import area_registry as ar
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import label_registry as lr
+from homeassistant.util.yaml import load_yaml
+
+from .api import AvalonMinerApiError
+from .config_flow import CannotConnect, async_validate_host
+from .const import (
+    CONF_POLLING_INTERVAL,
+    CONF_PORT,
+    DEFAULT_PORT,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    IMPORT_HOST_TIMEOUT,
+    LOGGER,
+)
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+ATTR_RACK = "rack"
+ATTR_INTERVAL = "interval"
+ATTR_LABELS = "labels"
+
+
+def _labels(value: Any) -> list[str]:
+    """Accept a list or a ;-separated string of label names."""
+    if isinstance(value, str):
+        value = value.split(";")
+    return [label.strip() for label in cv.ensure_list(value) if str(label).strip()]
+
+
+ROW_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_HOST): cv.string,
+        vol.Optional(CONF_PORT, default=DEFAULT_PORT): cv.port,
+        vol.Optional(ATTR_INTERVAL, default=DEFAULT_SCAN_INTERVAL): vol.All(
+            vol.Coerce(int), vol.Range(min=1)
+        ),
+        vol.Optional(ATTR_RACK): cv.string,
+        vol.Optional(ATTR_LABELS, default=[]): _labels,
+    },
+    extra=vol.REMOVE_EXTRA,
+)
+
+
+def _read_inventory(config_dir: str, name: str) -> list[dict[str, Any]]:
+    """Read the rows of a CSV or YAML inventory; runs in the executor.
+
+    The path is resolved relative to the configuration directory and must
+    stay inside it. CSV files need a header row. YAML files hold a list of
+    rows, or a mapping with the list under `miners`.
+    """
+    base = Path(config_dir).resolve()
+    path = (base / name).resolve()
+    if not path.is_relative_to(base):
+        raise HomeAssistantError(f"{name} is outside the configuration directory")
+    if not path.is_file():
+        raise HomeAssistantError(f"{path} does not exist")
+    if path.suffix.lower() == ".csv":
+        with path.open(encoding="utf-8", newline="") as file:
+            # Empty cells fall back to the defaults.
+            return [
+                {
+                    key.strip().lower(): value.strip()
+                    for key, value in row.items()
+                    if key and value and value.strip()
+                }
+                for row in csv.DictReader(file)
+            ]
+    content = load_yaml(path)
+    if isinstance(content, dict):
+        content = content.get("miners")
+    if not isinstance(content, list):
+        raise HomeAssistantError(f"{path} does not contain a list of miners")
+    return [row if isinstance(row, dict) else {} for row in content]
+
+
+async def _async_validate(host: str, port: int) -> dict[str, str]:
+    """Read the DNA, model and firmware of one host within the timeout."""
+    async with asyncio.timeout(IMPORT_HOST_TIMEOUT):
+        return await async_validate_host(host, port)
+
+
+def _assign_area_and_labels(
+    hass: HomeAssistant, entry_id: str, dna: str, rack: str | None, labels: list[str]
+) -> None:
+    """Put the miner's device into its rack's area and add its labels."""
+    if rack is None and not labels:
+        return
+    device_registry = dr.async_get(hass)
+    device = device_registry.async_get_or_create(
+        config_entry_id=entry_id, identifiers={(DOMAIN, dna)}
+    )
+    label_registry = lr.async_get(hass)
+    label_ids = {
+        (
+            label_registry.async_get_label_by_name(name)
+            or label_registry.async_create(name)
+        ).label_id
+        for name in labels
+    }
+    device_registry.async_update_device(
+        device.id,
+        area_id=(
+            ar.async_get(hass).async_get_or_create(rack).id
+            if rack is not None
+            else device.area_id
+        ),
+        labels=device.labels | label_ids,
+    )
+
+
+async def async_import_inventory(
+    hass: HomeAssistant, path: str, max_parallel: int
+) -> dict[str, Any]:
+    """Validate every miner of an inventory file and create their entries.
+
+    All hosts are read in parallel (at most `max_parallel` at a time) with
+    one `version` call each. Miners are deduplicated by DNA against the
+    existing entries and within the file; the others are created through
+    import flows, with their rack as area and their labels. Returns a
+    report of created, skipped, invalid and unreachable rows.
+    """
+    rows = await hass.async_add_executor_job(
+        _read_inventory, hass.config.config_dir, path
+    )
+
+    report: dict[str, list[dict[str, Any]]] = {
+        "created": [],
+        "already_configured": [],
+        "duplicate": [],
+        "invalid": [],
+        "unreachable": [],
+    }
+    miners: dict[tuple[str, int], dict[str, Any]] = {}
+    for number, row in enumerate(rows, start=1):
+        try:
+            miner = ROW_SCHEMA(row)
+        except vol.Invalid as exc:
+            report["invalid"].append({"row": number, "error": str(exc)})
+            continue
+        address = (miner[CONF_HOST], miner[CONF_PORT])
+        if address in miners:
+            report["duplicate"].append({"row": number, "host": miner[CONF_HOST]})
+            continue
+        miners[address] = miner
+
+    semaphore = asyncio.Semaphore(max_parallel)
+
+    async def _async_check(miner: dict[str, Any]) -> dict[str, str] | None:
+        async with semaphore:
+            try:
+                return await _async_validate(miner[CONF_HOST], miner[CONF_PORT])
+            except (CannotConnect, AvalonMinerApiError, TimeoutError) as exc:
+                report["unreachable"].append(
+                    {
+                        "host": miner[CONF_HOST],
+                        "port": miner[CONF_PORT],
+                        "error": str(exc) or type(exc).__name__,
+                    }
+                )
+                return None
+
+    infos = await asyncio.gather(*(_async_check(miner) for miner in miners.values()))
+
+    configured = {
+        entry.unique_id for entry in hass.config_entries.async_entries(DOMAIN)
+    }
+    to_create: dict[str, tuple[dict[str, Any], dict[str, str]]] = {}
+    for miner, info in zip(miners.values(), infos):
+        if info is None:
+            continue
+        dna = info["dna"]
+        if dna in configured:
+            report["already_configured"].append(
+                {"host": miner[CONF_HOST], "dna": dna}
+            )
+        elif dna in to_create:
+            report["duplicate"].append({"host": miner[CONF_HOST], "dna": dna})
+        else:
+            to_create[dna] = (miner, info)
+
+    async def _async_create(miner: dict[str, Any], info: dict[str, str]) -> None:
+        data = {
+            CONF_HOST: miner[CONF_HOST],
+            CONF_PORT: miner[CONF_PORT],
+            CONF_POLLING_INTERVAL: miner[ATTR_INTERVAL],
+            **info,
+        }
+        # Entry setup runs inside the flow, so creation is bounded as well.
+        async with semaphore:
+            result = await hass.config_entries.flow.async_init(
+                DOMAIN, context={"source": SOURCE_IMPORT}, data=data
+            )
+        if result["type"] is not FlowResultType.CREATE_ENTRY:
+            report["already_configured"].append(
+                {"host": miner[CONF_HOST], "dna": info["dna"]}
+            )
+            return
+        _assign_area_and_labels(
+            hass,
+            result["result"].entry_id,
+            info["dna"],
+            miner.get(ATTR_RACK),
+            miner[ATTR_LABELS],
+        )
+        report["created"].append(
+            {"host": miner[CONF_HOST], "dna": info["dna"], "model": info["model"]}
+        )
+
+    await asyncio.gather(
+        *(_async_create(miner, info) for miner, info in to_create.values())
+    )
+
+    if report["unreachable"]:
+        LOGGER.warning(
+            "Inventory import could not reach %d of %d hosts: %s",
+            len(report["unreachable"]),
+            len(miners),
+            ", ".join(
+                f"{miner['host']}:{miner['port']}" for miner in report["unreachable"]
+            ),
+        )
+    return report
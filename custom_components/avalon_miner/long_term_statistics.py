@@ -0,0 +1,150 @@
+"""Long-term statistics import for avalon_miner."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+)
+from homeassistant.const import UnitOfPower
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, STATISTICS_FLUSH_INTERVAL
+from .sampling import sample_value
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .data import AvalonMinerConfigEntry
+
+# Statistic name -> (snapshot key, scale, unit).
+STATISTICS = {
+    "hashrate": ("ghs_spd", 1 / 1000, "TH/s"),
+    "power": ("power_output", 1, UnitOfPower.WATT),
+}
+
+STATISTICS_KEYS = frozenset(key for key, _, _ in STATISTICS.values())
+
+STORAGE_VERSION = 1
+
+
+def _current_hour() -> datetime:
+    return dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+
+
+class LongTermStatistics:
+    """Buffer every sample in hourly buckets and import them as statistics.
+
+    Each bucket keeps count/sum/min/max only. The buffer is flushed every few
+    minutes; the hour in progress is re-imported on every flush (the recorder
+    overwrites rows with the same start) and dropped once it is complete.
+    The recorder only imports statistics starting on the hour, so there is no
+    5-minute level.
+
+    The bucket of the hour in progress is saved on every flush and loaded
+    again on setup, so a reload or restart adds to it instead of overwriting
+    the samples already imported for that hour.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: AvalonMinerConfigEntry) -> None:
+        """Initialize the buffer."""
+        self._hass = hass
+        self._entry = entry
+        object_id = entry.data["dna"].lower()
+        self._metadata = {
+            name: StatisticMetaData(
+                has_mean=True,
+                has_sum=False,
+                name=f"{entry.title} {name}",
+                source=DOMAIN,
+                statistic_id=f"{DOMAIN}:{object_id}_{name}",
+                unit_of_measurement=unit,
+            )
+            for name, (_, _, unit) in STATISTICS.items()
+        }
+        self._buckets: dict[str, dict[datetime, list[float]]] = {
+            name: {} for name in STATISTICS
+        }
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.statistics.{object_id}"
+        )
+
+    async def async_load(self) -> None:
+        """Seed the bucket of the current hour from the last flush."""
+        stored = await self._store.async_load() or {}
+        hour = _current_hour()
+        if stored.get("hour") != hour.isoformat():
+            return
+        for name, bucket in stored.get("buckets", {}).items():
+            if name in self._buckets:
+                self._buckets[name][hour] = bucket
+
+    @callback
+    def async_start(self) -> None:
+        """Start the periodic flush; the final one runs from async_unload_entry."""
+        self._entry.async_on_unload(
+            async_track_time_interval(
+                self._hass,
+                self._async_flush,
+                timedelta(seconds=STATISTICS_FLUSH_INTERVAL),
+            )
+        )
+
+    @callback
+    def async_add(self, sample: dict[str, Any]) -> None:
+        """Add one sample to the bucket of the current hour."""
+        hour = _current_hour()
+        for name, (key, scale, _) in STATISTICS.items():
+            value = sample_value(sample.get(key))
+            if value is None:
+                continue
+            value *= scale
+            bucket = self._buckets[name].get(hour)
+            if bucket is None:
+                self._buckets[name][hour] = [1, value, value, value]
+            else:
+                bucket[0] += 1
+                bucket[1] += value
+                bucket[2] = min(bucket[2], value)
+                bucket[3] = max(bucket[3], value)
+
+    async def _async_flush(self, _now: datetime) -> None:
+        await self.async_flush()
+
+    async def async_flush(self) -> None:
+        """Import all buffered buckets, drop the completed ones, save the rest."""
+        current_hour = _current_hour()
+        for name, buckets in self._buckets.items():
+            if not buckets:
+                continue
+            async_add_external_statistics(
+                self._hass,
+                self._metadata[name],
+                [
+                    StatisticData(
+                        start=start,
+                        mean=total / count,
+                        min=low,
+                        max=high,
+                    )
+                    for start, (count, total, low, high) in sorted(buckets.items())
+                ],
+            )
+            for start in [start for start in buckets if start < current_hour]:
+                del buckets[start]
+        await self._store.async_save(
+            {
+                "hour": current_hour.isoformat(),
+                "buckets": {
+                    name: buckets[current_hour]
+                    for name, buckets in self._buckets.items()
+                    if current_hour in buckets
+                },
+            }
+        )
@@ -0,0 +1,198 @@
+"""OpenMetrics exporter view for avalon_miner."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from aiohttp import web
+from homeassistant.const import CONF_HOST
+from homeassistant.helpers.http import KEY_HASS, HomeAssistantView
+
+from .const import DOMAIN
+from .fleet import async_get_loaded_coordinators
+from .sampling import sample_value
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .coordinator import AvalonMinerDataUpdateCoordinator
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+PREFIX = DOMAIN
+
+# Family name, type, help, and (snapshot key, extra labels, scale) per sample.
+SNAPSHOT_METRICS: tuple[
+    tuple[str, str, str, tuple[tuple[str, str, float], ...]], ...
+] = (
+    (
+        "hashrate_terahashes",
+        "gauge",
+        "Current hashrate (GHSspd).",
+        (("ghs_spd", "", 1 / 1000),),
+    ),
+    (
+        "hashrate_avg_terahashes",
+        "gauge",
+        "Average hashrate since start (GHSavg).",
+        (("ghs_avg", "", 1 / 1000),),
+    ),
+    (
+        "temperature_celsius",
+        "gauge",
+        "Temperatures reported in MM ID0.",
+        tuple(
+            (f"temp_{sensor}", f'sensor="{sensor}"', 1)
+            for sensor in ("avg", "max", "inlet", "target", "hb_inlet", "hb_outlet")
+        ),
+    ),
+    (
+        "fan_rpm",
+        "gauge",
+        "Fan speed.",
+        tuple((f"fan{fan}_rpm", f'fan="{fan}"', 1) for fan in range(1, 5)),
+    ),
+    (
+        "fan_speed_percent",
+        "gauge",
+        "Fan duty cycle.",
+        (("fan_speed_pct", "", 1),),
+    ),
+    ("power_watts", "gauge", "Power output (MPO).", (("power_output", "", 1),)),
+    (
+        "shares_accepted",
+        "counter",
+        "Accepted shares.",
+        (("accepted_shares", "", 1),),
+    ),
+    (
+        "shares_rejected",
+        "counter",
+        "Rejected shares.",
+        (("rejected_shares", "", 1),),
+    ),
+    (
+        "hardware_errors",
+        "counter",
+        "Hardware errors.",
+        (("hardware_errors", "", 1),),
+    ),
+    ("uptime_seconds", "gauge", "Miner uptime.", (("elapsed", "", 1),)),
+)
+
+# Snapshot keys the scrape reads; decoded on every poll once the endpoint
+# has been scraped, even where no enabled entity reads them.
+METRICS_KEYS = frozenset(
+    key for _, _, _, sources in SNAPSHOT_METRICS for key, _, _ in sources
+)
+
+DATA_METRICS_SCRAPED = f"{DOMAIN}_metrics_scraped"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(coordinator: AvalonMinerDataUpdateCoordinator) -> str:
+    entry = coordinator.entry
+    return ",".join(
+        (
+            f'dna="{_escape(coordinator.device)}"',
+            f'model="{_escape(entry.data.get("model", ""))}"',
+            f'host="{_escape(entry.data[CONF_HOST])}"',
+        )
+    )
+
+
+def _status_values(
+    coordinator: AvalonMinerDataUpdateCoordinator,
+) -> dict[str, float | None]:
+    sample = coordinator.sample or {}
+    soft_off = sample.get("soft_off")
+    return {
+        "up": float(coordinator.last_update_success),
+        "mining": None if soft_off is None else float(soft_off == "0"),
+        "poll_duration_seconds": coordinator.poll_duration,
+        "poll_errors": float(coordinator.poll_errors),
+    }
+
+
+STATUS_METRICS = (
+    ("up", "gauge", "Whether the latest poll succeeded."),
+    ("mining", "gauge", "Whether the miner is hashing (not soft-off)."),
+    ("poll_duration_seconds", "gauge", "Duration of the latest successful poll."),
+    ("poll_errors", "counter", "Failed polls since the integration started."),
+)
+
+
+class MetricsRenderer:
+    """Render cached snapshots, reusing the label set of every miner."""
+
+    def __init__(self) -> None:
+        """Initialize the renderer."""
+        self._labels: dict[tuple[str, str], str] = {}
+
+    def _miner_labels(self, coordinator: AvalonMinerDataUpdateCoordinator) -> str:
+        key = (coordinator.entry.entry_id, coordinator.entry.data[CONF_HOST])
+        if (labels := self._labels.get(key)) is None:
+            labels = self._labels[key] = _labels(coordinator)
+        return labels
+
+    def render(self, coordinators: list[AvalonMinerDataUpdateCoordinator]) -> str:
+        """Return all miners' metrics in OpenMetrics text format."""
+        miners = [
+            (self._miner_labels(coordinator), coordinator, _status_values(coordinator))
+            for coordinator in coordinators
+        ]
+        lines: list[str] = []
+
+        for name, kind, help_text in STATUS_METRICS:
+            family = f"{PREFIX}_{name}"
+            suffix = "_total" if kind == "counter" else ""
+            lines.append(f"# TYPE {family} {kind}")
+            lines.append(f"# HELP {family} {help_text}")
+            for labels, _, status in miners:
+                value = status[name]
+                if value is not None:
+                    lines.append(f"{family}{suffix}{{{labels}}} {value}")
+
+        samples: list[tuple[str, dict[str, Any]]] = [
+            (labels, coordinator.sample)
+            for labels, coordinator, _ in miners
+            if coordinator.sample is not None
+        ]
+        for name, kind, help_text, sources in SNAPSHOT_METRICS:
+            family = f"{PREFIX}_{name}"
+            suffix = "_total" if kind == "counter" else ""
+            lines.append(f"# TYPE {family} {kind}")
+            lines.append(f"# HELP {family} {help_text}")
+            for labels, sample in samples:
+                for key, extra, scale in sources:
+                    value = sample_value(sample.get(key))
+                    if value is None:
+                        continue
+                    all_labels = f"{labels},{extra}" if extra else labels
+                    lines.append(f"{family}{suffix}{{{all_labels}}} {value * scale}")
+
+        lines.append("# EOF\n")
+        return "\n".join(lines)
+
+
+class AvalonMinerMetricsView(HomeAssistantView):
+    """Serve the fleet's latest snapshots for Prometheus scrapes."""
+
+    url = f"/api/{DOMAIN}/metrics"
+    name = f"api:{DOMAIN}:metrics"
+
+    def __init__(self) -> None:
+        """Initialize the view."""
+        self._renderer = MetricsRenderer()
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Render the metrics of every loaded miner."""
+        hass: HomeAssistant = request.app[KEY_HASS]
+        hass.data[DATA_METRICS_SCRAPED] = True
+        return web.Response(
+            body=self._renderer.render(async_get_loaded_coordinators(hass)).encode(),
+            headers={"Content-Type": CONTENT_TYPE},
+        )
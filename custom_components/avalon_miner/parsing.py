@@ -0,0 +1,103 @@
+"""Batched off-loop decoding of miner replies for avalon_miner."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+
+from .api import build_snapshot
+from .const import DOMAIN, PARSE_BATCH_DELAY
+
+if TYPE_CHECKING:
+    from collections.abc import Collection
+
+    from homeassistant.core import HomeAssistant
+
+DATA_BATCH_PARSER = f"{DOMAIN}_batch_parser"
+
+type ParseJob = tuple[dict[str, bytes | Exception], Collection[str] | None, str]
+
+
+def parse_batch(jobs: list[ParseJob]) -> list[dict[str, Any] | Exception]:
+    """Build the snapshots of a batch of polls; runs in the executor.
+
+    Any error is returned in place of that poll's snapshot, so one bad
+    reply only fails its own poll.
+    """
+    snapshots: list[dict[str, Any] | Exception] = []
+    for raw, keys, source in jobs:
+        try:
+            snapshots.append(build_snapshot(raw, keys, source))
+        except Exception as exc:
+            snapshots.append(exc)
+    return snapshots
+
+
+class BatchParser:
+    """Collect raw replies from many miners and decode them in one job.
+
+    Polls that finish within PARSE_BATCH_DELAY of each other share one
+    executor job, so a large fleet costs a few thread hand-offs per poll
+    cycle instead of one per miner, and only typed snapshots come back to
+    the event loop.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the parser."""
+        self._hass = hass
+        self._jobs: list[ParseJob] = []
+        self._futures: list[asyncio.Future[dict[str, Any]]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+
+    async def async_parse(
+        self,
+        raw: dict[str, bytes | Exception],
+        keys: Collection[str] | None,
+        source: str,
+    ) -> dict[str, Any]:
+        """Queue one poll for decoding and wait for its snapshot."""
+        future: asyncio.Future[dict[str, Any]] = self._hass.loop.create_future()
+        self._jobs.append((raw, keys, source))
+        self._futures.append(future)
+        if self._flush_handle is None:
+            self._flush_handle = self._hass.loop.call_later(
+                PARSE_BATCH_DELAY, self._async_flush
+            )
+        return await future
+
+    @callback
+    def _async_flush(self) -> None:
+        """Hand the queued polls to the executor."""
+        self._flush_handle = None
+        jobs, futures = self._jobs, self._futures
+        self._jobs, self._futures = [], []
+        self._hass.async_create_background_task(
+            self._async_run(jobs, futures), f"{DOMAIN} parse batch"
+        )
+
+    async def _async_run(
+        self,
+        jobs: list[ParseJob],
+        futures: list[asyncio.Future[dict[str, Any]]],
+    ) -> None:
+        try:
+            snapshots = await self._hass.async_add_executor_job(parse_batch, jobs)
+        except Exception as exc:
+            snapshots = [exc] * len(futures)
+        for future, snapshot in zip(futures, snapshots):
+            if future.done():
+                continue
+            if isinstance(snapshot, Exception):
+                future.set_exception(snapshot)
+            else:
+                future.set_result(snapshot)
+
+
+@callback
+def async_get_batch_parser(hass: HomeAssistant) -> BatchParser:
+    """Return the parser shared by all miners."""
+    if (parser := hass.data.get(DATA_BATCH_PARSER)) is None:
+        parser = hass.data[DATA_BATCH_PARSER] = BatchParser(hass)
+    return parser
@@ -0,0 +1,125 @@
+"""On-demand profiling of the update pipeline for avalon_miner."""
+
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import io
+import pstats
+import tracemalloc
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.util import dt as dt_util
+
+from .const import DEFAULT_SCAN_INTERVAL, DOMAIN, LOGGER, SIGNAL_SAMPLE
+from .fleet import async_get_loaded_coordinators
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+DATA_PROFILING = f"{DOMAIN}_profiling"
+
+# Frames kept per tracemalloc traceback, and lines of each report section.
+TRACEMALLOC_FRAMES = 10
+REPORT_LINES = 40
+
+
+def _write_report(
+    profile: cProfile.Profile,
+    snapshot: tracemalloc.Snapshot | None,
+    pstats_path: str,
+    summary_path: str,
+    header: str,
+) -> None:
+    """Write the pstats dump and a text summary; runs in the executor."""
+    profile.dump_stats(pstats_path)
+    out = io.StringIO()
+    out.write(header)
+    out.write("\n\nTop functions by cumulative time:\n")
+    stats = pstats.Stats(profile, stream=out)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(REPORT_LINES)
+    out.write("\nTop functions by internal time:\n")
+    stats.sort_stats(pstats.SortKey.TIME).print_stats(REPORT_LINES)
+    if snapshot is not None:
+        out.write("\nTop allocations by line:\n")
+        for stat in snapshot.statistics("lineno")[:REPORT_LINES]:
+            out.write(f"{stat}\n")
+    with open(summary_path, "w", encoding="utf-8") as file:
+        file.write(out.getvalue())
+
+
+async def async_profile(hass: HomeAssistant, cycles: int) -> dict[str, Any]:
+    """Profile the event loop until every loaded miner polled `cycles` times.
+
+    Only the event loop thread is profiled: socket I/O, decoding and parsing
+    (unless offloaded), coordinator listeners and entity state writes.
+    Nothing is installed while no profile is running.
+    """
+    if hass.data.get(DATA_PROFILING):
+        raise HomeAssistantError("A profile is already running")
+    coordinators = async_get_loaded_coordinators(hass)
+    if not coordinators:
+        raise HomeAssistantError("No miners are loaded")
+
+    remaining = {coordinator.device: cycles for coordinator in coordinators}
+    done = asyncio.Event()
+
+    @callback
+    def _async_on_sample(dna: str, _sample: dict[str, Any]) -> None:
+        if remaining.get(dna, 0) > 0:
+            remaining[dna] -= 1
+            if not any(remaining.values()):
+                done.set()
+
+    # Miners that stop answering end the profile after the slowest poll
+    # interval times the requested cycles, plus one interval of slack.
+    timeout = max(
+        (
+            coordinator.update_interval.total_seconds()
+            for coordinator in coordinators
+            if coordinator.update_interval is not None
+        ),
+        default=DEFAULT_SCAN_INTERVAL,
+    ) * (cycles + 1)
+
+    hass.data[DATA_PROFILING] = True
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+    unsub = async_dispatcher_connect(hass, SIGNAL_SAMPLE, _async_on_sample)
+    profile = cProfile.Profile()
+    start = dt_util.utcnow()
+    try:
+        # Raises ValueError on Python 3.12+ while another profiler is active.
+        profile.enable()
+        async with asyncio.timeout(timeout):
+            await done.wait()
+    except TimeoutError:
+        LOGGER.warning("Profile timed out before every miner finished polling")
+    except ValueError as exc:
+        raise HomeAssistantError(f"Another profiler is active: {exc}") from exc
+    finally:
+        profile.disable()
+        unsub()
+        snapshot = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+        if started_tracing:
+            tracemalloc.stop()
+        hass.data[DATA_PROFILING] = False
+
+    stamp = start.strftime("%Y%m%d%H%M%S")
+    pstats_path = hass.config.path(f"{DOMAIN}_profile_{stamp}.pstats")
+    summary_path = hass.config.path(f"{DOMAIN}_profile_{stamp}.txt")
+    completed = {dna: cycles - left for dna, left in remaining.items()}
+    header = (
+        f"Avalon Miner profile started {start.isoformat()}, "
+        f"{len(coordinators)} miners, {cycles} cycles requested, "
+        f"{sum(completed.values())} polls captured"
+    )
+    await hass.async_add_executor_job(
+        _write_report, profile, snapshot, pstats_path, summary_path, header
+    )
+    LOGGER.info("Wrote profile to %s and %s", pstats_path, summary_path)
+    return {"pstats": pstats_path, "summary": summary_path, "cycles": completed}
@@ -0,0 +1,61 @@
+"""Sample aggregation for avalon_miner."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+# cgminer reports missing sensors as -273 °C.
+SENTINEL = -273
+
+
+def sample_value(value: Any) -> float | None:
+    """Convert a raw snapshot value ("45%", "65", 1200.5) to float."""
+    if value is None:
+        return None
+    try:
+        number = float(value.replace("%", "") if isinstance(value, str) else value)
+    except (ValueError, TypeError):
+        return None
+    return number if number != SENTINEL else None
+
+
+class SampleWindow:
+    """Running count/sum/min/max per key over one publish window."""
+
+    def __init__(self, keys: Iterable[str]) -> None:
+        """Initialize the window."""
+        self._keys = tuple(keys)
+        self._stats: dict[str, list[float]] = {}
+
+    def add(self, sample: dict[str, Any]) -> None:
+        """Add one sample to the window."""
+        for key in self._keys:
+            value = sample_value(sample.get(key))
+            if value is None:
+                continue
+            stats = self._stats.get(key)
+            if stats is None:
+                self._stats[key] = [1, value, value, value]
+            else:
+                stats[0] += 1
+                stats[1] += value
+                stats[2] = min(stats[2], value)
+                stats[3] = max(stats[3], value)
+
+    def aggregate(self, sample: dict[str, Any]) -> dict[str, Any]:
+        """Return the latest sample with windowed keys replaced by their mean.
+
+        Min, max and sample count per key are stored under "window" and the
+        window is reset.
+        """
+        data = dict(sample)
+        window: dict[str, dict[str, float]] = {}
+        for key, (count, total, low, high) in self._stats.items():
+            data[key] = total / count
+            window[key] = {"min": low, "max": high, "samples": count}
+        data["window"] = window
+        self._stats = {}
+        return data
@@ -0,0 +1,351 @@
+"""Energy-price-aware work-mode scheduler for avalon_miner."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import (
+    async_track_state_change_event,
+    async_track_time_interval,
+)
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .anomaly import Ewma
+from .api import AvalonMinerApiError
+from .const import (
+    CONF_HASHPRICE,
+    CONF_MIN_DWELL,
+    CONF_PRICE_ENTITY,
+    CONF_PRICE_FORECAST_ATTRIBUTE,
+    CONF_SCHEDULER_MODE,
+    CURTAIL_MODE_OFF,
+    DEFAULT_FLEET_DEADLINE,
+    DEFAULT_HASHPRICE,
+    DEFAULT_MIN_DWELL,
+    DOMAIN,
+    LOGGER,
+    MODE_SETTLE_TIME,
+    SCHEDULER_INTERVAL,
+    SCHEDULER_MODE_ACTIVE,
+    WORK_MODE_MAP,
+)
+from .fleet import async_apply_mode, describe_state
+from .sampling import sample_value
+
+if TYPE_CHECKING:
+    from homeassistant.core import Event, EventStateChangedData, State
+
+    from .coordinator import AvalonMinerDataUpdateCoordinator
+
+STORAGE_VERSION = 1
+
+# Samples of a mode before its power and hashrate estimate is trusted.
+PROFILE_WARMUP = 5
+PROFILE_ALPHA = 0.05
+
+MINER_MODES = (CURTAIL_MODE_OFF, *WORK_MODE_MAP.values())
+
+# Snapshot keys the mode profile learns from.
+PROFILE_KEYS = frozenset({"power_output", "ghs_spd"})
+
+
+def signal_scheduler_updated(entry_id: str) -> str:
+    """Return the dispatcher signal sent after every scheduler evaluation."""
+    return f"{DOMAIN}_scheduler_{entry_id}"
+
+
+class ModeProfile:
+    """Learn the power and hashrate of every work mode from live samples.
+
+    Samples taken within MODE_SETTLE_TIME of a mode change are skipped, so
+    ramp-up after soft-on or a mode switch does not pull the estimates down.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty estimates."""
+        self._power = {mode: Ewma(PROFILE_ALPHA) for mode in MINER_MODES}
+        self._hashrate = {mode: Ewma(PROFILE_ALPHA) for mode in MINER_MODES}
+        self._mode: str | None = None
+        self._mode_since = 0.0
+
+    def add(self, sample: dict[str, Any]) -> None:
+        """Add one sample to the estimate of the mode it was taken in."""
+        mode = describe_state(sample)
+        now = time.monotonic()
+        if mode != self._mode:
+            self._mode, self._mode_since = mode, now
+            return
+        if mode not in MINER_MODES or now - self._mode_since < MODE_SETTLE_TIME:
+            return
+        power = sample_value(sample.get("power_output"))
+        if power is not None:
+            self._power[mode].update(power)
+        hashrate = sample_value(sample.get("ghs_spd"))
+        if hashrate is not None:
+            self._hashrate[mode].update(hashrate / 1000)
+
+    def estimates(self) -> dict[str, tuple[float, float]]:
+        """Return mode -> (power W, hashrate TH/s) for the learned modes.
+
+        Soft-off is always included, at its measured idle draw or 0 W.
+        """
+        estimates = {
+            mode: (self._power[mode].mean, self._hashrate[mode].mean)
+            for mode in WORK_MODE_MAP.values()
+            if self._power[mode].count >= PROFILE_WARMUP
+            and self._hashrate[mode].count >= PROFILE_WARMUP
+        }
+        idle = self._power[CURTAIL_MODE_OFF]
+        estimates[CURTAIL_MODE_OFF] = (
+            idle.mean if idle.count >= PROFILE_WARMUP else 0.0,
+            0.0,
+        )
+        return estimates
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the estimates for storage."""
+        return {
+            mode: {
+                "power": [self._power[mode].mean, self._power[mode].count],
+                "hashrate": [self._hashrate[mode].mean, self._hashrate[mode].count],
+            }
+            for mode in MINER_MODES
+        }
+
+    def load(self, data: dict[str, Any]) -> None:
+        """Restore stored estimates."""
+        for mode, stored in data.items():
+            if mode not in MINER_MODES:
+                continue
+            self._power[mode].mean, self._power[mode].count = stored["power"]
+            self._hashrate[mode].mean, self._hashrate[mode].count = stored[
+                "hashrate"
+            ]
+
+
+def _forecast_start(entry: dict[str, Any]) -> datetime | None:
+    start = entry.get("start")
+    if isinstance(start, str):
+        start = dt_util.parse_datetime(start)
+    return start if isinstance(start, datetime) else None
+
+
+def _forecast_value(entry: dict[str, Any]) -> float | None:
+    for key in ("value", "price", "total"):
+        if (value := sample_value(entry.get(key))) is not None:
+            return value
+    return None
+
+
+def price_outlook(
+    state: State, attribute: str | None, now: datetime, horizon: timedelta
+) -> float | None:
+    """Return the mean price over [now, now + horizon].
+
+    Uses a forecast attribute holding a list of {start, [end,] value|price}
+    entries (one hour long unless they carry an end) when configured and
+    present; otherwise the current state.
+    """
+    forecast = state.attributes.get(attribute) if attribute else None
+    if isinstance(forecast, list):
+        until = now + horizon
+        weighted = seconds = 0.0
+        for entry in forecast:
+            if not isinstance(entry, dict):
+                continue
+            start = _forecast_start(entry)
+            value = _forecast_value(entry)
+            if start is None or value is None:
+                continue
+            end = entry.get("end")
+            if isinstance(end, str):
+                end = dt_util.parse_datetime(end)
+            if not isinstance(end, datetime):
+                end = start + timedelta(hours=1)
+            overlap = (min(end, until) - max(start, now)).total_seconds()
+            if overlap > 0:
+                weighted += value * overlap
+                seconds += overlap
+        if seconds:
+            return weighted / seconds
+    return sample_value(state.state)
+
+
+def hourly_margins(
+    estimates: dict[str, tuple[float, float]], price: float, hashprice: float
+) -> dict[str, float]:
+    """Return mode -> estimated margin per hour.
+
+    price is per kWh, hashprice per TH/s per day, both in the same currency.
+    """
+    return {
+        mode: hashrate * hashprice / 24 - power / 1000 * price
+        for mode, (power, hashrate) in estimates.items()
+    }
+
+
+class MinerScheduler:
+    """Pick the work mode with the best margin for one miner.
+
+    In dry-run mode the recommendation is only reported; in active mode it
+    is applied. Either way the mode only changes after the minimum dwell,
+    and projected savings are accumulated against the mode the miner was
+    in when the scheduler started.
+    """
+
+    def __init__(self, coordinator: AvalonMinerDataUpdateCoordinator) -> None:
+        """Initialize the scheduler."""
+        self._coordinator = coordinator
+        self._hass = coordinator.hass
+        entry = coordinator.entry
+        options = entry.options
+        self.mode: str = options[CONF_SCHEDULER_MODE]
+        self._price_entity: str = options[CONF_PRICE_ENTITY]
+        self._forecast_attribute: str | None = options.get(
+            CONF_PRICE_FORECAST_ATTRIBUTE
+        )
+        self._hashprice = options.get(CONF_HASHPRICE, DEFAULT_HASHPRICE)
+        self._dwell = timedelta(minutes=options.get(CONF_MIN_DWELL, DEFAULT_MIN_DWELL))
+        self._store: Store[dict[str, Any]] = Store(
+            self._hass,
+            STORAGE_VERSION,
+            f"{DOMAIN}.mode_profile.{coordinator.device.lower()}",
+        )
+        self.profile = ModeProfile()
+        self.recommendation: str | None = None
+        self.baseline: str | None = None
+        self.price: float | None = None
+        self.margins: dict[str, float] = {}
+        self.savings_per_hour = 0.0
+        self.projected_savings = 0.0
+        self.held_until: datetime | None = None
+        self.paused: str | None = None
+        self._chosen: str | None = None
+        self._chosen_since = dt_util.utcnow()
+        self._last_evaluation: datetime | None = None
+        self._lock = asyncio.Lock()
+
+    async def async_start(self) -> None:
+        """Load the learned profile and evaluate on price changes and interval.
+
+        The first evaluation is left to the caller.
+        """
+        if stored := await self._store.async_load():
+            self.profile.load(stored)
+        entry = self._coordinator.entry
+        entry.async_on_unload(
+            async_track_state_change_event(
+                self._hass, [self._price_entity], self._async_price_changed
+            )
+        )
+        entry.async_on_unload(
+            async_track_time_interval(
+                self._hass,
+                self._async_interval,
+                timedelta(seconds=SCHEDULER_INTERVAL),
+            )
+        )
+
+    @callback
+    def async_add_sample(self, sample: dict[str, Any]) -> None:
+        """Learn from one sample."""
+        self.profile.add(sample)
+
+    async def _async_price_changed(self, _event: Event[EventStateChangedData]) -> None:
+        await self.async_evaluate()
+
+    async def _async_interval(self, _now: datetime) -> None:
+        await self.async_evaluate()
+
+    async def async_evaluate(self) -> None:
+        """Recompute margins, the recommendation and projected savings."""
+        async with self._lock:
+            await self._async_evaluate()
+
+    async def _async_evaluate(self) -> None:
+        now = dt_util.utcnow()
+        mode = describe_state(self._coordinator.sample)
+        state = self._hass.states.get(self._price_entity)
+        self.price = (
+            price_outlook(state, self._forecast_attribute, now, self._dwell)
+            if state is not None
+            else None
+        )
+        if self._last_evaluation is not None:
+            hours = (now - self._last_evaluation).total_seconds() / 3600
+            self.projected_savings += self.savings_per_hour * hours
+        self._last_evaluation = now
+        if mode is None or self.price is None:
+            self.savings_per_hour = 0.0
+            self._async_notify()
+            return
+        if self.baseline is None:
+            self.baseline = mode
+
+        self.margins = hourly_margins(
+            self.profile.estimates(), self.price, self._hashprice
+        )
+        # The mode the miner is in (active) or was last recommended (dry run),
+        # and since when; it is kept for at least the minimum dwell.
+        chosen = mode if self.mode == SCHEDULER_MODE_ACTIVE else self.recommendation
+        chosen = chosen or mode
+        if chosen != self._chosen:
+            # How long the miner was in its mode before startup is unknown,
+            # so the first change is not held back.
+            self._chosen_since = (
+                now if self._chosen is not None else now - self._dwell
+            )
+            self._chosen = chosen
+        best = max(self.margins, key=self.margins.__getitem__)
+        self.held_until = None
+        if chosen not in self.margins:
+            # Nothing to compare against until the mode has been learned.
+            best = chosen
+        elif best != chosen and now < self._chosen_since + self._dwell:
+            self.held_until = self._chosen_since + self._dwell
+            best = chosen
+        self.recommendation = best
+
+        # A curtail or a tuning run owns the work mode until it is done;
+        # until then the pick is only reported.
+        self.paused = None
+        if self._coordinator.curtail_state is not None:
+            self.paused = "curtailed"
+        elif self._coordinator.tuning:
+            self.paused = "tuning"
+        if self.mode == SCHEDULER_MODE_ACTIVE and best != mode and not self.paused:
+            LOGGER.info(
+                "Scheduler switching %s from %s to %s at price %s",
+                self._coordinator.entry.title,
+                mode,
+                best,
+                self.price,
+            )
+            try:
+                async with asyncio.timeout(DEFAULT_FLEET_DEADLINE):
+                    await async_apply_mode(self._coordinator, best)
+            except (AvalonMinerApiError, TimeoutError) as exc:
+                LOGGER.warning("Scheduler could not switch to %s: %s", best, exc)
+            await self._coordinator.async_refresh_now()
+
+        baseline_margin = self.margins.get(self.baseline)
+        best_margin = self.margins.get(best)
+        self.savings_per_hour = (
+            best_margin - baseline_margin
+            if best_margin is not None and baseline_margin is not None
+            else 0.0
+        )
+        self._store.async_delay_save(self.profile.as_dict)
+        self._async_notify()
+
+    @callback
+    def _async_notify(self) -> None:
+        async_dispatcher_send(
+            self._hass, signal_scheduler_updated(self._coordinator.entry.entry_id)
+        )
@@ -0,0 +1,328 @@
+"""Services for avalon_miner."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import voluptuous as vol
+from homeassistant.core import SupportsResponse
+from homeassistant.helpers import config_validation as cv
+
+from .const import (
+    ATTR_BATCH_DELAY,
+    ATTR_BATCH_SIZE,
+    ATTR_CYCLES,
+    ATTR_DEADLINE,
+    ATTR_FAN_SPEED,
+    ATTR_MAX_FAILURES,
+    ATTR_MAX_PARALLEL,
+    ATTR_MAX_TEMP,
+    ATTR_MIN_HASHRATE,
+    ATTR_MODE,
+    ATTR_PATH,
+    ATTR_POWER_LIMIT,
+    ATTR_RECOVERY_TIMEOUT,
+    ATTR_REMEASURE,
+    ATTR_SETTLE_TIME,
+    ATTR_TARGET_TEMP,
+    ATTR_TARGET_TEMPS,
+    ATTR_WINDOW,
+    ATTR_WORK_MODE,
+    ATTR_WORK_MODES,
+    CURTAIL_MODE_OFF,
+    DEFAULT_BATCH_DELAY,
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_FLEET_DEADLINE,
+    DEFAULT_IMPORT_PARALLEL,
+    DEFAULT_MAX_FAILURES,
+    DEFAULT_MAX_PARALLEL,
+    DEFAULT_MIN_HASHRATE,
+    DEFAULT_PROFILE_CYCLES,
+    DEFAULT_RECOVERY_TIMEOUT,
+    DEFAULT_SETTLE_TIME,
+    DEFAULT_TUNE_MAX_TEMP,
+    DEFAULT_TUNE_TARGET_TEMPS,
+    DEFAULT_TUNE_WINDOW,
+    DOMAIN,
+    SERVICE_APPLY_SETTINGS,
+    SERVICE_CURTAIL,
+    SERVICE_IMPORT_INVENTORY,
+    SERVICE_PROFILE,
+    SERVICE_RESTORE,
+    SERVICE_ROLLING_REBOOT,
+    SERVICE_TUNE,
+    WORK_MODE_MAP,
+)
+from .fleet import (
+    async_apply_settings,
+    async_curtail,
+    async_get_loaded_coordinators,
+    async_get_target_coordinators,
+    async_restore,
+    async_rolling_reboot,
+    async_run_fleet,
+)
+from .importer import async_import_inventory
+from .profiling import async_profile
+from .sampling import sample_value
+from .tuning import PowerBudget, TuningPlan, async_tune_fleet
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse
+
+FLEET_SCHEMA = {
+    **cv.ENTITY_SERVICE_FIELDS,
+    vol.Optional(ATTR_DEADLINE, default=DEFAULT_FLEET_DEADLINE): vol.All(
+        vol.Coerce(float), vol.Range(min=1)
+    ),
+    vol.Optional(ATTR_MAX_PARALLEL, default=DEFAULT_MAX_PARALLEL): vol.All(
+        vol.Coerce(int), vol.Range(min=1)
+    ),
+}
+
+CURTAIL_SCHEMA = vol.Schema(
+    {
+        **FLEET_SCHEMA,
+        vol.Optional(ATTR_MODE, default=CURTAIL_MODE_OFF): vol.In(
+            [CURTAIL_MODE_OFF, *WORK_MODE_MAP.values()]
+        ),
+    }
+)
+
+RESTORE_SCHEMA = vol.Schema(FLEET_SCHEMA)
+
+ROLLING_REBOOT_SCHEMA = vol.Schema(
+    {
+        **cv.ENTITY_SERVICE_FIELDS,
+        vol.Optional(ATTR_BATCH_SIZE, default=DEFAULT_BATCH_SIZE): vol.All(
+            vol.Coerce(int), vol.Range(min=1)
+        ),
+        vol.Optional(ATTR_BATCH_DELAY, default=DEFAULT_BATCH_DELAY): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+        vol.Optional(
+            ATTR_RECOVERY_TIMEOUT, default=DEFAULT_RECOVERY_TIMEOUT
+        ): vol.All(vol.Coerce(float), vol.Range(min=30)),
+        vol.Optional(ATTR_MIN_HASHRATE, default=DEFAULT_MIN_HASHRATE): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=100)
+        ),
+        vol.Optional(ATTR_MAX_FAILURES, default=DEFAULT_MAX_FAILURES): vol.All(
+            vol.Coerce(int), vol.Range(min=0)
+        ),
+    }
+)
+
+SETTING_FIELDS = (ATTR_WORK_MODE, ATTR_TARGET_TEMP, ATTR_FAN_SPEED)
+
+APPLY_SETTINGS_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            **FLEET_SCHEMA,
+            vol.Optional(ATTR_WORK_MODE): vol.In(list(WORK_MODE_MAP.values())),
+            vol.Optional(ATTR_TARGET_TEMP): vol.All(
+                vol.Coerce(int), vol.Range(min=50, max=90)
+            ),
+            vol.Optional(ATTR_FAN_SPEED): vol.All(
+                vol.Coerce(int),
+                vol.Any(0, vol.Range(min=25, max=100)),
+            ),
+        }
+    ),
+    cv.has_at_least_one_key(*SETTING_FIELDS),
+)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CYCLES, default=DEFAULT_PROFILE_CYCLES): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=100)
+        ),
+    }
+)
+
+IMPORT_INVENTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_PATH): cv.string,
+        vol.Optional(ATTR_MAX_PARALLEL, default=DEFAULT_IMPORT_PARALLEL): vol.All(
+            vol.Coerce(int), vol.Range(min=1)
+        ),
+    }
+)
+
+TUNE_SCHEMA = vol.Schema(
+    {
+        **cv.ENTITY_SERVICE_FIELDS,
+        vol.Optional(
+            ATTR_WORK_MODES, default=list(WORK_MODE_MAP.values())
+        ): vol.All(cv.ensure_list, [vol.In(list(WORK_MODE_MAP.values()))]),
+        vol.Optional(ATTR_TARGET_TEMPS, default=DEFAULT_TUNE_TARGET_TEMPS): vol.All(
+            cv.ensure_list, [vol.All(vol.Coerce(int), vol.Range(min=50, max=90))]
+        ),
+        vol.Optional(ATTR_SETTLE_TIME, default=DEFAULT_SETTLE_TIME): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+        vol.Optional(ATTR_WINDOW, default=DEFAULT_TUNE_WINDOW): vol.All(
+            vol.Coerce(float), vol.Range(min=30)
+        ),
+        vol.Optional(ATTR_MAX_TEMP, default=DEFAULT_TUNE_MAX_TEMP): vol.Coerce(float),
+        vol.Optional(ATTR_POWER_LIMIT): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(ATTR_MAX_PARALLEL, default=DEFAULT_MAX_PARALLEL): vol.All(
+            vol.Coerce(int), vol.Range(min=1)
+        ),
+        vol.Optional(ATTR_REMEASURE, default=False): cv.boolean,
+    }
+)
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services."""
+
+    async def async_handle_curtail(call: ServiceCall) -> ServiceResponse:
+        """Curtail the targeted miners and confirm the new state."""
+        coordinators = await async_get_target_coordinators(hass, call)
+        mode = call.data[ATTR_MODE]
+        results = await async_run_fleet(
+            coordinators,
+            lambda coordinator: async_curtail(coordinator, mode),
+            call.data[ATTR_MAX_PARALLEL],
+            call.data[ATTR_DEADLINE],
+        )
+        for coordinator in coordinators:
+            await coordinator.async_request_refresh()
+        return {"miners": results}
+
+    async def async_handle_restore(call: ServiceCall) -> ServiceResponse:
+        """Restore the targeted miners to their pre-curtail state."""
+        coordinators = await async_get_target_coordinators(hass, call)
+        results = await async_run_fleet(
+            coordinators,
+            async_restore,
+            call.data[ATTR_MAX_PARALLEL],
+            call.data[ATTR_DEADLINE],
+        )
+        for coordinator in coordinators:
+            await coordinator.async_request_refresh()
+        return {"miners": results}
+
+    async def async_handle_rolling_reboot(call: ServiceCall) -> ServiceResponse:
+        """Reboot the targeted miners batch by batch."""
+        coordinators = await async_get_target_coordinators(hass, call)
+        result = await async_rolling_reboot(
+            coordinators,
+            call.data[ATTR_BATCH_SIZE],
+            call.data[ATTR_BATCH_DELAY],
+            call.data[ATTR_RECOVERY_TIMEOUT],
+            call.data[ATTR_MIN_HASHRATE],
+            call.data[ATTR_MAX_FAILURES],
+        )
+        for coordinator in coordinators:
+            await coordinator.async_request_refresh()
+        return result
+
+    async def async_handle_apply_settings(call: ServiceCall) -> ServiceResponse:
+        """Apply the same settings to the targeted miners in parallel."""
+        coordinators = await async_get_target_coordinators(hass, call)
+        settings = {
+            field: call.data[field] for field in SETTING_FIELDS if field in call.data
+        }
+        results = await async_run_fleet(
+            coordinators,
+            lambda coordinator: async_apply_settings(coordinator, settings),
+            call.data[ATTR_MAX_PARALLEL],
+            call.data[ATTR_DEADLINE],
+        )
+        return {"miners": results}
+
+    async def async_handle_profile(call: ServiceCall) -> ServiceResponse:
+        """Profile the next polls of every miner and write the report."""
+        return await async_profile(hass, call.data[ATTR_CYCLES])
+
+    async def async_handle_import_inventory(call: ServiceCall) -> ServiceResponse:
+        """Validate and add every miner of an inventory file."""
+        return await async_import_inventory(
+            hass, call.data[ATTR_PATH], call.data[ATTR_MAX_PARALLEL]
+        )
+
+    async def async_handle_tune(call: ServiceCall) -> ServiceResponse:
+        """Start tuning the targeted miners within the site power limit."""
+        coordinators = await async_get_target_coordinators(hass, call)
+        tuned = {coordinator.device for coordinator in coordinators}
+        # Miners that are not tuned keep drawing what they draw now.
+        baseline = sum(
+            sample_value((coordinator.sample or {}).get("power_output")) or 0.0
+            for coordinator in async_get_loaded_coordinators(hass)
+            if coordinator.device not in tuned
+        )
+        budget = PowerBudget(call.data.get(ATTR_POWER_LIMIT), baseline)
+        plan = TuningPlan(
+            work_modes=call.data[ATTR_WORK_MODES],
+            target_temps=call.data[ATTR_TARGET_TEMPS],
+            settle_time=call.data[ATTR_SETTLE_TIME],
+            window=call.data[ATTR_WINDOW],
+            max_temp=call.data[ATTR_MAX_TEMP],
+            remeasure=call.data[ATTR_REMEASURE],
+        )
+        hass.async_create_background_task(
+            async_tune_fleet(
+                coordinators, plan, budget, call.data[ATTR_MAX_PARALLEL]
+            ),
+            f"{DOMAIN} tune",
+        )
+        return {
+            "miners": {
+                coordinator.device: {
+                    "name": coordinator.entry.title,
+                    "status": "started",
+                }
+                for coordinator in coordinators
+            }
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_CURTAIL,
+        async_handle_curtail,
+        schema=CURTAIL_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_RESTORE,
+        async_handle_restore,
+        schema=RESTORE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_ROLLING_REBOOT,
+        async_handle_rolling_reboot,
+        schema=ROLLING_REBOOT_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_APPLY_SETTINGS,
+        async_handle_apply_settings,
+        schema=APPLY_SETTINGS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        async_handle_profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_IMPORT_INVENTORY,
+        async_handle_import_inventory,
+        schema=IMPORT_INVENTORY_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_TUNE,
+        async_handle_tune,
+        schema=TUNE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
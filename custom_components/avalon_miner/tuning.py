@@ -0,0 +1,366 @@
+"""Per-miner efficiency tuning for avalon_miner."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .api import AvalonMinerApiError
+from .const import (
+    CURTAIL_MODE_OFF,
+    DEFAULT_FLEET_DEADLINE,
+    DOMAIN,
+    LOGGER,
+    SCHEDULER_MODE_ACTIVE,
+    SIGNAL_SAMPLE,
+)
+from .fleet import async_apply_settings, async_run_fleet, describe_state
+from .sampling import sample_value
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .coordinator import AvalonMinerDataUpdateCoordinator
+
+STORAGE_VERSION = 1
+
+# avalon_miner_event types reporting the progress of a run.
+EVENT_TUNING_STEP = "tuning_step"
+EVENT_TUNING_FINISHED = "tuning_finished"
+
+# Snapshot keys every poll decodes while a miner is being tuned.
+TUNING_KEYS = frozenset({"power_output", "ghs_spd", "temp_max"})
+
+
+@dataclass(frozen=True)
+class TuningPlan:
+    """The settings to try and how to measure them."""
+
+    work_modes: list[str]
+    target_temps: list[int]
+    settle_time: float
+    window: float
+    max_temp: float
+    remeasure: bool = False
+
+    def settings(self) -> list[tuple[str, int]]:
+        """Return every (work mode, target temperature) combination."""
+        return [(mode, temp) for mode in self.work_modes for temp in self.target_temps]
+
+
+def _setting_key(work_mode: str, target_temp: int) -> str:
+    return f"{work_mode}|{target_temp}"
+
+
+class PowerBudget:
+    """Share a site power limit between miners stepping through settings.
+
+    Every tuned miner holds a reservation: its expected draw before a step is
+    measured, its measured draw afterwards, and the draw of its final setting
+    once done. Loaded miners that are not tuned count with the draw they had
+    when the run started.
+    """
+
+    def __init__(self, limit: float | None, baseline: float) -> None:
+        """Initialize the budget."""
+        self._limit = limit
+        self._baseline = baseline
+        self._reserved: dict[str, float] = {}
+        self._condition = asyncio.Condition()
+
+    def _fits(self, dna: str, watts: float) -> bool:
+        if self._limit is None or watts <= self._reserved.get(dna, 0.0):
+            return True
+        others = sum(value for key, value in self._reserved.items() if key != dna)
+        return self._baseline + others + watts <= self._limit
+
+    async def async_reserve(self, dna: str, watts: float, timeout: float) -> bool:
+        """Wait until the draw fits the limit and reserve it.
+
+        Returns False if it did not fit within the timeout.
+        """
+        async with self._condition:
+            try:
+                async with asyncio.timeout(timeout):
+                    await self._condition.wait_for(lambda: self._fits(dna, watts))
+            except TimeoutError:
+                return False
+            self._reserved[dna] = watts
+            return True
+
+    async def async_set(self, dna: str, watts: float) -> None:
+        """Set a miner's reservation to its known draw."""
+        async with self._condition:
+            self._reserved[dna] = watts
+            self._condition.notify_all()
+
+    def exceeded(self) -> bool:
+        """Return True if the reserved draw is above the limit."""
+        return (
+            self._limit is not None
+            and self._baseline + sum(self._reserved.values()) > self._limit
+        )
+
+
+def _store(hass: HomeAssistant, dna: str) -> Store[dict[str, Any]]:
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.tuning.{dna.lower()}")
+
+
+async def async_load_results(
+    coordinator: AvalonMinerDataUpdateCoordinator,
+) -> dict[str, Any]:
+    """Return the stored tuning results of a miner's current firmware."""
+    stored = await _store(coordinator.hass, coordinator.device).async_load() or {}
+    if stored.get("firmware") != coordinator.entry.data.get("firmware", ""):
+        return {}
+    return stored
+
+
+async def _async_measure(
+    coordinator: AvalonMinerDataUpdateCoordinator, window: float
+) -> dict[str, float] | None:
+    """Average power and hashrate, and the peak temperature, over a window."""
+    power: list[float] = []
+    hashrate: list[float] = []
+    temp_max: list[float] = []
+
+    @callback
+    def _async_on_sample(dna: str, sample: dict[str, Any]) -> None:
+        if dna != coordinator.device or describe_state(sample) is None:
+            return
+        for key, values in (
+            ("power_output", power),
+            ("ghs_spd", hashrate),
+            ("temp_max", temp_max),
+        ):
+            if (value := sample_value(sample.get(key))) is not None:
+                values.append(value)
+
+    unsub = async_dispatcher_connect(coordinator.hass, SIGNAL_SAMPLE, _async_on_sample)
+    try:
+        await asyncio.sleep(window)
+    finally:
+        unsub()
+
+    if not power or not hashrate:
+        return None
+    watts = sum(power) / len(power)
+    terahashes = sum(hashrate) / len(hashrate) / 1000
+    return {
+        "power": round(watts, 1),
+        "hashrate": round(terahashes, 3),
+        "efficiency": round(watts / terahashes, 2) if terahashes else None,
+        "temp_max": max(temp_max) if temp_max else None,
+        "samples": len(power),
+    }
+
+
+def _best(
+    results: dict[str, dict[str, Any]], keys: list[str], max_temp: float
+) -> str | None:
+    """Return the most efficient measured setting that stayed below max_temp."""
+    candidates = [
+        key
+        for key in keys
+        if (result := results.get(key)) is not None
+        and result["efficiency"] is not None
+        and result["temp_max"] is not None
+        and result["temp_max"] <= max_temp
+    ]
+    return min(candidates, key=lambda key: results[key]["efficiency"], default=None)
+
+
+def _expected_power(
+    results: dict[str, dict[str, Any]], key: str, current: float
+) -> float:
+    """Return the measured draw of a setting, or the highest draw seen so far."""
+    if (result := results.get(key)) is not None:
+        return result["power"]
+    return max((result["power"] for result in results.values()), default=current)
+
+
+async def _async_restore(
+    coordinator: AvalonMinerDataUpdateCoordinator,
+    original: dict[str, Any],
+    active: dict[str, Any],
+) -> None:
+    """Put a miner whose tuning failed back on its original setting."""
+    if active == original or coordinator.curtail_state is not None:
+        return
+    try:
+        async with asyncio.timeout(DEFAULT_FLEET_DEADLINE):
+            await async_apply_settings(coordinator, original)
+    except (AvalonMinerApiError, TimeoutError) as exc:
+        LOGGER.warning(
+            "Could not restore %s to %s after tuning failed: %s",
+            coordinator.entry.title,
+            original,
+            exc,
+        )
+
+
+async def async_tune(
+    coordinator: AvalonMinerDataUpdateCoordinator,
+    plan: TuningPlan,
+    budget: PowerBudget,
+) -> dict[str, Any]:
+    """Step one miner through the plan and keep its most efficient setting.
+
+    Every setting is applied, left to settle, and measured over the window.
+    Settings already stored for the current firmware are reused unless the
+    plan asks to remeasure. The best setting whose peak temperature stayed
+    within max_temp is applied at the end; without one, the miner returns to
+    the setting it had before. If tuning fails, the original setting is
+    restored on a best-effort basis before the error propagates. Every
+    measured setting fires a tuning_step event.
+    """
+    if coordinator.tuning:
+        return {"status": "already_tuning"}
+    sample = coordinator.sample
+    mode = describe_state(sample)
+    if mode is None:
+        return {"status": "unknown_state"}
+    if mode == CURTAIL_MODE_OFF:
+        return {"status": "not_running"}
+    if coordinator.curtail_state is not None:
+        # Stepping up to Super would defeat a demand-response curtail.
+        return {"status": "curtailed", "current": mode}
+    scheduler = coordinator.scheduler
+    if scheduler is not None and scheduler.mode == SCHEDULER_MODE_ACTIVE:
+        # The scheduler would switch modes in the middle of a measurement.
+        return {"status": "scheduler_active"}
+
+    dna = coordinator.device
+    firmware = coordinator.entry.data.get("firmware", "")
+    store = _store(coordinator.hass, dna)
+    results: dict[str, dict[str, Any]] = (
+        (await async_load_results(coordinator)).get("results", {})
+    )
+    original: dict[str, Any] = {"work_mode": mode}
+    if (target_temp := sample_value(sample.get("temp_target"))) is not None:
+        original["target_temp"] = int(target_temp)
+    active = original
+    settings = plan.settings()
+    keys = [_setting_key(*setting) for setting in settings]
+    skipped: dict[str, str] = {}
+    wait = plan.settle_time + plan.window
+
+    current = original_power = sample_value(sample.get("power_output")) or 0.0
+    await budget.async_set(dna, current)
+    coordinator.tuning = True
+    finished = interrupted = False
+    try:
+        for step, ((work_mode, target_temp), key) in enumerate(
+            zip(settings, keys), start=1
+        ):
+            if key in results and not plan.remeasure:
+                continue
+            if not await budget.async_reserve(
+                dna, _expected_power(results, key, current), wait
+            ):
+                skipped[key] = "power_limit"
+                continue
+            setting = {"work_mode": work_mode, "target_temp": target_temp}
+            async with asyncio.timeout(DEFAULT_FLEET_DEADLINE):
+                applied = await async_apply_settings(coordinator, setting)
+            active = setting
+            if applied["status"] != "confirmed":
+                skipped[key] = "unconfirmed"
+                continue
+            await asyncio.sleep(plan.settle_time)
+            if describe_state(coordinator.sample) != work_mode:
+                # Soft-off or changed from outside; stop rather than fight it.
+                skipped[key] = "interrupted"
+                interrupted = True
+                break
+            measured = await _async_measure(coordinator, plan.window)
+            if measured is None:
+                skipped[key] = "no_samples"
+                continue
+            current = measured["power"]
+            await budget.async_set(dna, current)
+            results[key] = {
+                **setting,
+                **measured,
+                "measured_at": dt_util.utcnow().isoformat(),
+            }
+            await store.async_save({"firmware": firmware, "results": results})
+            LOGGER.debug("Tuning %s at %s: %s", coordinator.entry.title, key, measured)
+            coordinator.async_fire_event(
+                EVENT_TUNING_STEP,
+                {"step": step, "steps": len(settings), **results[key]},
+            )
+            if budget.exceeded():
+                skipped[key] = "power_limit"
+                break
+
+        best = _best(results, keys, plan.max_temp)
+        final: dict[str, Any] | None = original
+        if best is not None:
+            final = {
+                "work_mode": results[best]["work_mode"],
+                "target_temp": results[best]["target_temp"],
+            }
+        if interrupted or coordinator.curtail_state is not None:
+            # Leave a change made from outside (soft-off, curtail) alone.
+            final = None
+        elif final != active:
+            async with asyncio.timeout(DEFAULT_FLEET_DEADLINE):
+                await async_apply_settings(coordinator, final)
+        if best is not None and final is not None:
+            await budget.async_set(dna, results[best]["power"])
+        else:
+            await budget.async_set(dna, original_power)
+        finished = True
+    finally:
+        if not finished:
+            await _async_restore(coordinator, original, active)
+            await budget.async_set(dna, original_power)
+        coordinator.tuning = False
+
+    await store.async_save(
+        {
+            "firmware": firmware,
+            "results": results,
+            "best": best,
+            "tuned_at": dt_util.utcnow().isoformat(),
+        }
+    )
+    status = "tuned" if best is not None else "no_setting_within_limits"
+    report: dict[str, Any] = {
+        "status": "interrupted" if final is None else status,
+        "applied": final,
+        "results": {key: results[key] for key in keys if key in results},
+    }
+    if skipped:
+        report["skipped"] = skipped
+    return report
+
+
+async def async_tune_fleet(
+    coordinators: list[AvalonMinerDataUpdateCoordinator],
+    plan: TuningPlan,
+    budget: PowerBudget,
+    max_parallel: int,
+) -> None:
+    """Tune miners in parallel and fire a tuning_finished event for each.
+
+    A run takes a settle time plus a window per setting, so the tune service
+    starts this in the background instead of waiting for it.
+    """
+    results = await async_run_fleet(
+        coordinators,
+        lambda coordinator: async_tune(coordinator, plan, budget),
+        max_parallel,
+    )
+    for coordinator in coordinators:
+        coordinator.async_fire_event(
+            EVENT_TUNING_FINISHED, results[coordinator.device]
+        )
+        await coordinator.async_request_refresh()
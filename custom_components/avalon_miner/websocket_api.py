@@ -0,0 +1,172 @@
+"""Live telemetry websocket stream for avalon_miner."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.core import callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .const import DOMAIN, SIGNAL_SAMPLE, STREAM_FIELDS, STREAM_FLUSH_INTERVAL
+from .fleet import async_get_loaded_coordinators
+
+if TYPE_CHECKING:
+    import asyncio
+
+    from homeassistant.core import HomeAssistant
+
+    from .coordinator import AvalonMinerDataUpdateCoordinator
+
+# Snapshot values that can be streamed; lists and dicts stay out of the stream.
+_SCALAR_TYPES = (str, int, float, bool)
+
+DATA_STREAMS = f"{DOMAIN}_streams"
+
+
+@callback
+def async_setup_websocket(hass: HomeAssistant) -> None:
+    """Register the websocket commands."""
+    websocket_api.async_register_command(hass, websocket_subscribe)
+
+
+@callback
+def async_subscribed_fields(hass: HomeAssistant, dna: str) -> set[str]:
+    """Return the fields open subscriptions want from one miner."""
+    fields: set[str] = set()
+    for stream in hass.data.get(DATA_STREAMS, ()):
+        if stream.wants(dna):
+            fields.update(stream.fields)
+    return fields
+
+
+class TelemetryStream:
+    """Send one subscriber the changed fields of every new sample.
+
+    Deltas are merged per miner and field until the next flush, so a fleet
+    costs at most one message per STREAM_FLUSH_INTERVAL and a slow client
+    only ever has the latest value of each field pending.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        connection: websocket_api.ActiveConnection,
+        msg_id: int,
+        miners: set[str] | None,
+        fields: tuple[str, ...],
+    ) -> None:
+        """Initialize the stream."""
+        self._hass = hass
+        self._connection = connection
+        self._msg_id = msg_id
+        self._miners = miners
+        self.fields = fields
+        self._sent: dict[str, dict[str, Any]] = {}
+        self._pending: dict[str, dict[str, Any]] = {}
+        self._flush_handle: asyncio.TimerHandle | None = None
+
+    def _values(self, sample: dict[str, Any]) -> dict[str, Any]:
+        return {
+            key: value
+            for key in self.fields
+            if isinstance(value := sample.get(key), _SCALAR_TYPES)
+        }
+
+    @callback
+    def async_send_initial(
+        self, coordinators: list[AvalonMinerDataUpdateCoordinator]
+    ) -> None:
+        """Send the latest full sample of every matching miner."""
+        snapshot: dict[str, dict[str, Any]] = {}
+        for coordinator in coordinators:
+            if coordinator.sample is None or not self.wants(coordinator.device):
+                continue
+            snapshot[coordinator.device] = self._values(coordinator.sample)
+        self._sent = {dna: dict(values) for dna, values in snapshot.items()}
+        self._connection.send_message(
+            websocket_api.event_message(self._msg_id, {"miners": snapshot})
+        )
+
+    def wants(self, dna: str) -> bool:
+        """Return True if the subscriber asked for this miner."""
+        return self._miners is None or dna in self._miners
+
+    @callback
+    def async_on_sample(self, dna: str, sample: dict[str, Any]) -> None:
+        """Queue the fields that changed since the last message."""
+        if not self.wants(dna):
+            return
+        sent = self._sent.setdefault(dna, {})
+        delta = {
+            key: value
+            for key, value in self._values(sample).items()
+            if sent.get(key) != value
+        }
+        if not delta:
+            return
+        sent.update(delta)
+        self._pending.setdefault(dna, {}).update(delta)
+        if self._flush_handle is None:
+            self._flush_handle = self._hass.loop.call_later(
+                STREAM_FLUSH_INTERVAL, self._async_flush
+            )
+
+    @callback
+    def _async_flush(self) -> None:
+        self._flush_handle = None
+        pending, self._pending = self._pending, {}
+        self._connection.send_message(
+            websocket_api.event_message(self._msg_id, {"miners": pending})
+        )
+
+    @callback
+    def async_close(self) -> None:
+        """Stop sending."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/subscribe",
+        vol.Optional("miners"): [str],
+        vol.Optional("fields"): [str],
+    }
+)
+@callback
+def websocket_subscribe(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Stream per-miner sample deltas, filtered by miner DNA and field.
+
+    The first event holds the latest sample of every matching miner; later
+    events only the fields that changed. Nothing goes through entity state.
+    """
+    miners = msg.get("miners")
+    stream = TelemetryStream(
+        hass,
+        connection,
+        msg["id"],
+        set(miners) if miners else None,
+        tuple(msg.get("fields") or STREAM_FIELDS),
+    )
+    unsub = async_dispatcher_connect(hass, SIGNAL_SAMPLE, stream.async_on_sample)
+    # Polls decode the subscribed fields from now on, even those no enabled
+    # entity reads.
+    streams: set[TelemetryStream] = hass.data.setdefault(DATA_STREAMS, set())
+    streams.add(stream)
+
+    @callback
+    def async_unsubscribe() -> None:
+        unsub()
+        streams.discard(stream)
+        stream.async_close()
+
+    connection.subscriptions[msg["id"]] = async_unsubscribe
+    connection.send_result(msg["id"])
+    stream.async_send_initial(async_get_loaded_coordinators(hass))
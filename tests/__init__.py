@@ -0,0 +1 @@
+"""Tests for the avalon_miner integration."""
@@ -0,0 +1,46 @@
+"""Benchmark decode_response against the previous str-based decoding.
+
+Run with `python -m tests.benchmark_decode` from the repository root.
+"""
+
+from __future__ import annotations
+
+import json
+import timeit
+
+from custom_components.avalon_miner.api import decode_response
+
+SOURCE = "192.0.2.1:4028"
+ROUNDS = 20_000
+
+# An estats reply of a single-module miner, with a long MM ID0 string.
+MM_ID0 = " ".join(f"Field{index}[{index * 17}]" for index in range(160))
+ESTATS = (
+    '{"STATUS":[{"STATUS":"S","When":1700000000,"Code":70,"Msg":"CGMiner stats",'
+    '"Description":"cgminer 4.11.1"}],"STATS":[{"STATS":0,"ID":"AVA100",'
+    f'"Elapsed":86400,"MM ID0":"{MM_ID0}"}},'
+    '{"STATS":1,"ID":"POOL0","Elapsed":86400}],"id":1}'
+).encode() + b"\x00"
+# The same reply with the missing comma cgminer emits on multi-device STATS.
+BROKEN = ESTATS.replace(b"},{", b"}{")
+
+
+def _previous(raw: bytes) -> dict:
+    """Decode a reply the way api.py did before orjson."""
+    return json.loads(raw.decode("utf-8").rstrip("\x00").strip())
+
+
+def main() -> None:
+    """Print the time per reply of both decoders."""
+    assert decode_response(ESTATS, SOURCE) == _previous(ESTATS)
+    for name, call in (
+        ("json.loads(decode().rstrip())", lambda: _previous(ESTATS)),
+        ("decode_response", lambda: decode_response(ESTATS, SOURCE)),
+        ("decode_response (repaired)", lambda: decode_response(BROKEN, SOURCE)),
+    ):
+        seconds = min(timeit.repeat(call, number=ROUNDS, repeat=5))
+        print(f"{name:32} {seconds / ROUNDS * 1e6:8.2f} µs/reply")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Tests for decoding raw cgminer replies."""
+
+from __future__ import annotations
+
+import pytest
+
+from custom_components.avalon_miner.api import (
+    AvalonMinerApiCommunicationError,
+    decode_response,
+    repair_json,
+)
+
+SOURCE = "192.0.2.1:4028"
+
+
+def test_decode_valid_reply() -> None:
+    """A well-formed, NUL-terminated reply decodes as is."""
+    raw = (
+        b'{"STATUS":[{"STATUS":"S","Msg":"Summary"}],'
+        b'"SUMMARY":[{"Elapsed":42}],"id":1}\x00'
+    )
+    assert decode_response(raw, SOURCE) == {
+        "STATUS": [{"STATUS": "S", "Msg": "Summary"}],
+        "SUMMARY": [{"Elapsed": 42}],
+        "id": 1,
+    }
+
+
+# Broken replies seen from cgminer firmware, and what they decode to.
+CORPUS = [
+    pytest.param(
+        b'{"STATS":[{"STATS":0,"ID":"AVA10"}{"STATS":1,"ID":"POOL0"}],"id":1}\x00',
+        {"STATS": [{"STATS": 0, "ID": "AVA10"}, {"STATS": 1, "ID": "POOL0"}], "id": 1},
+        id="missing-comma",
+    ),
+    pytest.param(
+        b'{"STATS":[{"STATS":0}\n  {"STATS":1}],"id":1}',
+        {"STATS": [{"STATS": 0}, {"STATS": 1}], "id": 1},
+        id="missing-comma-whitespace",
+    ),
+    pytest.param(
+        b'{"POOLS":[{"POOL":0,"URL":"stratum+tcp://pool"},],"id":1,}\x00',
+        {"POOLS": [{"POOL": 0, "URL": "stratum+tcp://pool"}], "id": 1},
+        id="trailing-comma",
+    ),
+    pytest.param(
+        b'{"STATUS":[{"STATUS":"S"}],"id":1}\x00\x1a\xffgarbage',
+        {"STATUS": [{"STATUS": "S"}], "id": 1},
+        id="trailing-garbage",
+    ),
+    pytest.param(
+        b'{"STATUS":[{"STATUS":"S"}],"id":1}' + b"\x00" * 64 + b"\r\n",
+        {"STATUS": [{"STATUS": "S"}], "id": 1},
+        id="nul-padded",
+    ),
+    pytest.param(
+        b'{"STATS":[{"a":1}{"b":2},],"id":1}\x00garbage',
+        {"STATS": [{"a": 1}, {"b": 2}], "id": 1},
+        id="all-defects",
+    ),
+]
+
+
+@pytest.mark.parametrize(("raw", "expected"), CORPUS)
+def test_decode_repaired_reply(raw: bytes, expected: dict) -> None:
+    """Replies with known cgminer defects are repaired and decoded."""
+    assert decode_response(raw, SOURCE) == expected
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        pytest.param(b"", id="empty"),
+        pytest.param(b"\x00", id="only-padding"),
+        pytest.param(b'{"STATUS":[{"STATUS":"S"', id="truncated"),
+        pytest.param(b"Connection refused", id="not-json"),
+    ],
+)
+def test_decode_unrepairable_reply(raw: bytes) -> None:
+    """Replies that stay invalid after repair raise a communication error."""
+    with pytest.raises(AvalonMinerApiCommunicationError):
+        decode_response(raw, SOURCE)
+
+
+def test_repair_keeps_strings() -> None:
+    """`}{` and `,}` inside string values survive the repair."""
+    raw = b'{"POOLS":[{"User":"a}{b","Pass":"x,}","URL":"\\"}{"}{"POOL":1},]}'
+    assert repair_json(raw) == (
+        b'{"POOLS":[{"User":"a}{b","Pass":"x,}","URL":"\\"}{"},{"POOL":1}]}'
+    )
+
+
+def test_decode_repaired_reply_keeps_strings() -> None:
+    """A repaired reply decodes with its string values untouched."""
+    raw = b'{"POOLS":[{"User":"a}{b"}{"User":"c, ]"},],"id":1}\x00'
+    assert decode_response(raw, SOURCE) == {
+        "POOLS": [{"User": "a}{b"}, {"User": "c, ]"}],
+        "id": 1,
+    }
+
+
+def test_valid_reply_with_braces_in_strings_is_not_repaired() -> None:
+    """Valid replies never reach repair_json, so their strings are untouched."""
+    raw = b'{"POOLS":[{"User":"a}{b","Pass":"x,}"}],"id":1}\x00'
+    assert decode_response(raw, SOURCE) == {
+        "POOLS": [{"User": "a}{b", "Pass": "x,}"}],
+        "id": 1,
+    }